@@ -3,20 +3,33 @@ Main Application Entry Point
 Fund Portfolio Intelligence System
 """
 
+import sys
+import json
+import time
+import sqlite3
+import hashlib
 import uuid
+import asyncio
 import logging
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict
 
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import QueuePool
 from langchain_neo4j import GraphCypherQAChain, Neo4jGraph
 from langchain_community.utilities import SQLDatabase
-from langchain_community.agent_toolkits import SQLDatabaseToolkit
 from langchain.agents import create_agent
-from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+import aiosqlite
+from langchain_core.messages import AIMessage
 
-from src.agents.query_router import IntelligentQueryRouter, GraphPlanner
+from src.agents.query_router import IntelligentQueryRouter, GraphPlanner, schema_fingerprint
+from src.agents.cypher_cache import CachedCypherQAChain
 from src.utils.config import get_settings, get_neo4j_config, get_database_config
+from src.utils.llm import get_chat_groq
 from src.database.sql_tools import get_all_tools
-from langchain_groq import ChatGroq
 
 logging.basicConfig(
     level=logging.INFO,
@@ -25,6 +38,33 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# System prompt for SQL agent
+SQL_SYSTEM_PROMPT_TEMPLATE = """
+You are an agent designed to interact with a SQL database.
+Given an input question, create a syntactically correct {dialect} query to run,
+then look at the results of the query and return the answer.
+
+Unless the user specifies a specific number of examples they wish to obtain,
+always limit your query to at most {top_k} results.
+
+You can order the results by a relevant column to return the most interesting
+examples in the database.
+
+Never query for all the columns from a specific table, only ask for the
+relevant columns given the question.
+
+You MUST double check your query before executing it. If you get an error
+while executing a query, rewrite the query and try again.
+
+DO NOT make any DML statements (INSERT, UPDATE, DELETE, DROP etc.) to the database.
+
+To start you should ALWAYS look at the tables in the database to see what you
+can query. Do NOT skip this step.
+
+Then you should query the schema of the most relevant tables.
+"""
+
+
 class FundIntelligenceSystem:
     """Main system orchestrating SQL and Graph database agents"""
     
@@ -35,12 +75,8 @@ class FundIntelligenceSystem:
         # Load configuration
         self.settings = get_settings()
         
-        # Initialize LLM
-        self.llm = ChatGroq(
-            model=self.settings.groq_model,
-            api_key=self.settings.groq_api_key,
-            temperature=self.settings.groq_temperature
-        )
+        # Initialize LLM (shared client, see get_chat_groq)
+        self.llm = get_chat_groq()
         
         # Initialize query router
         self.router = IntelligentQueryRouter()
@@ -56,94 +92,284 @@ class FundIntelligenceSystem:
         logger.info("✅ System initialized successfully")
     
     def _init_sql_database(self):
-        """Initialize SQL database connection"""
+        """Initialize pooled SQL database connections"""
         db_config = get_database_config()
         db_path = str(db_config.sqlite_path)
         
-        self.sql_db = SQLDatabase.from_uri(f"sqlite:///{db_path}")
-        logger.info(f"✅ Connected to SQLite: {db_path}")
+        # Pooled connections let concurrent batch_query workers read in parallel
+        engine = create_engine(
+            f"sqlite:///{db_path}",
+            poolclass=QueuePool,
+            pool_size=db_config.pool_size,
+            max_overflow=db_config.pool_size,
+            connect_args={"check_same_thread": False},
+        )
+        
+        @event.listens_for(engine, "connect")
+        def _set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA cache_size=-64000")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.close()
+        
+        self.sql_db = SQLDatabase(engine=engine)
+        logger.info(f"✅ Connected to SQLite: {db_path} (pool size {db_config.pool_size})")
     
     def _init_graph_database(self):
         """Initialize Neo4j graph database"""
         neo4j_config = get_neo4j_config()
         
+        # Schema introspection is expensive, so it is not run on connect;
+        # a fresh on-disk copy is used when available
         self.graph_db = Neo4jGraph(
             url=neo4j_config.url,
             username=neo4j_config.username,
             password=neo4j_config.password,
+            database=neo4j_config.database,
             enhanced_schema=True,
+            refresh_schema=False,
+            driver_config={
+                "max_connection_pool_size": neo4j_config.pool_size,
+                "connection_acquisition_timeout": neo4j_config.connection_acquisition_timeout,
+                "max_transaction_retry_time": neo4j_config.max_transaction_retry_time,
+            },
         )
-        self.graph_db.refresh_schema()
+        
+        if not self._load_schema_cache():
+            self.reload_schema()
         
         logger.info("✅ Connected to Neo4j")
-        logger.info(f"Graph Schema:\n{self.graph_db.schema[:500]}...")
+        logger.info(f"Graph Schema:\n{self._cached_schema[:500]}...")
     
-    def _init_sql_agent(self):
-        """Initialize SQL agent with tools"""
-        # Get all tools (SQL toolkit + custom tools)
-        all_tools = get_all_tools(self.sql_db, self.llm)
-        
-        # System prompt for SQL agent
-        sql_system_prompt = """
-        You are an agent designed to interact with a SQL database.
-        Given an input question, create a syntactically correct {dialect} query to run,
-        then look at the results of the query and return the answer.
-        
-        Unless the user specifies a specific number of examples they wish to obtain,
-        always limit your query to at most {top_k} results.
-        
-        You can order the results by a relevant column to return the most interesting
-        examples in the database.
+    def _set_schema(self, schema: str, structured_schema: Dict):
+        """Install a schema on the graph and remember its fingerprint"""
+        self.graph_db.schema = schema
+        self.graph_db.structured_schema = structured_schema
+        self._cached_schema = schema
+        self._schema_hash = schema_fingerprint(schema)
+    
+    def _schema_cache_key(self) -> list:
+        """Identify the database a cached schema belongs to"""
+        neo4j_config = get_neo4j_config()
+        return [neo4j_config.url, neo4j_config.database, neo4j_config.username]
+    
+    def _load_schema_cache(self) -> bool:
+        """
+        Load the Neo4j schema from the on-disk cache
         
-        Never query for all the columns from a specific table, only ask for the
-        relevant columns given the question.
+        Returns:
+            True if a fresh cache entry for this database was loaded
+        """
+        cache_path = Path(self.settings.neo4j_schema_cache_path)
         
-        You MUST double check your query before executing it. If you get an error
-        while executing a query, rewrite the query and try again.
+        try:
+            if time.time() - cache_path.stat().st_mtime > self.settings.neo4j_schema_cache_ttl:
+                return False
+            
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            
+            if cached.get("key") != self._schema_cache_key():
+                return False
+            
+            self._set_schema(cached["schema"], cached["structured_schema"])
+            logger.info(f"✅ Loaded Neo4j schema from cache: {cache_path}")
+            return True
+            
+        except (OSError, ValueError, KeyError):
+            return False
+    
+    def reload_schema(self):
+        """Recompute the Neo4j schema, persist it and drop stale graph plans"""
+        self.graph_db.refresh_schema()
+        self._set_schema(self.graph_db.schema, self.graph_db.structured_schema)
         
-        DO NOT make any DML statements (INSERT, UPDATE, DELETE, DROP etc.) to the database.
+        cache_path = Path(self.settings.neo4j_schema_cache_path)
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                json.dump(
+                    {
+                        "key": self._schema_cache_key(),
+                        "schema": self.graph_db.schema,
+                        "structured_schema": self.graph_db.structured_schema,
+                    },
+                    f,
+                    default=str
+                )
+        except OSError as e:
+            logger.warning(f"⚠️ Could not write schema cache: {e}")
         
-        To start you should ALWAYS look at the tables in the database to see what you
-        can query. Do NOT skip this step.
+        # The Cypher chain embeds the schema at construction, so rebuild it
+        # (this also starts a fresh plan cache)
+        if hasattr(self, "graph_agent"):
+            self._init_graph_agent()
+    
+    def _init_sql_agent(self):
+        """Initialize SQL agent with tools"""
+        # Get all tools (SQL toolkit + custom tools)
+        self.sql_tools = get_all_tools(self.sql_db, self.llm)
         
-        Then you should query the schema of the most relevant tables.
-        """.format(
+        # Format the static prompt once; its hash identifies the cacheable prefix
+        self.sql_system_prompt = SQL_SYSTEM_PROMPT_TEMPLATE.format(
             dialect=self.sql_db.dialect,
             top_k=self.settings.top_k_results,
         )
+        self.sql_system_prompt_hash = hashlib.blake2b(
+            self.sql_system_prompt.encode("utf-8")
+        ).digest()
         
         # Create agent with checkpoint
-        self.checkpointer = InMemorySaver()
+        self._init_checkpointer()
         self.sql_agent = create_agent(
             self.llm,
-            all_tools,
-            system_prompt=sql_system_prompt,
+            self.sql_tools,
+            system_prompt=self.sql_system_prompt,
             checkpointer=self.checkpointer,
         )
         
+        # Async twin on AsyncSqliteSaver, built per event loop on first use
+        self._async_sql_agent = None
+        
         logger.info("✅ SQL Agent initialized")
     
+    async def _get_async_sql_agent(self):
+        """
+        SQL agent backed by AsyncSqliteSaver for the running event loop
+        
+        SqliteSaver has no async methods, so ainvoke needs its own agent.
+        Unlike a worker-thread invoke, its runs stop when the task is
+        cancelled. The aiosqlite connection is bound to one loop, so a new
+        agent is built whenever the loop changes (e.g. per asyncio.run).
+        
+        Returns:
+            Compiled agent sharing the SQLite checkpoint file
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_sql_agent is None or self._async_sql_agent[0] is not loop:
+            # Cache the build task, so concurrent first callers share it
+            self._async_sql_agent = (loop, loop.create_task(self._build_async_sql_agent()))
+        return await asyncio.shield(self._async_sql_agent[1])
+    
+    async def _build_async_sql_agent(self):
+        """Create the AsyncSqliteSaver-backed SQL agent"""
+        conn = await aiosqlite.connect(str(self.settings.checkpoint_db_path))
+        checkpointer = AsyncSqliteSaver(conn)
+        await checkpointer.setup()
+        
+        return create_agent(
+            self.llm,
+            self.sql_tools,
+            system_prompt=self.sql_system_prompt,
+            checkpointer=checkpointer,
+        )
+    
+    async def aclose(self):
+        """Close the async SQL agent's checkpoint connection, if one is open"""
+        if self._async_sql_agent is None:
+            return
+        
+        loop, build = self._async_sql_agent
+        self._async_sql_agent = None
+        if loop is not asyncio.get_running_loop():
+            return  # Its loop is gone; nothing left to await on
+        
+        try:
+            sql_agent = await build
+        except Exception:
+            return  # The agent was never built
+        await sql_agent.checkpointer.conn.close()
+    
+    def _init_checkpointer(self):
+        """
+        Initialize the persistent SQLite checkpointer for the SQL agent
+        
+        Conversation state lives on disk (surviving restarts) instead of
+        growing in process memory; threads idle for longer than
+        CHECKPOINT_TTL_HOURS are pruned at startup and at the start of each
+        batch_query/abatch_query call (single queries never prune).
+        """
+        db_path = Path(self.settings.checkpoint_db_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        
+        self.checkpointer = SqliteSaver(conn)
+        self.checkpointer.setup()
+        
+        with self.checkpointer.cursor() as cur:
+            cur.execute(
+                "CREATE TABLE IF NOT EXISTS thread_activity ("
+                "thread_id TEXT PRIMARY KEY, last_used REAL NOT NULL)"
+            )
+        
+        self._prune_checkpoints()
+        logger.info(f"✅ Checkpoints stored in: {db_path}")
+    
+    def _touch_thread(self, thread_id: str):
+        """Record that a conversation thread was just used"""
+        with self.checkpointer.cursor() as cur:
+            cur.execute(
+                "INSERT OR REPLACE INTO thread_activity (thread_id, last_used) VALUES (?, ?)",
+                (thread_id, time.time())
+            )
+    
+    def _prune_checkpoints(self):
+        """Delete checkpoints of threads idle for longer than the TTL"""
+        cutoff = time.time() - self.settings.checkpoint_ttl_hours * 3600
+        
+        with self.checkpointer.cursor(transaction=False) as cur:
+            cur.execute(
+                "SELECT thread_id FROM thread_activity WHERE last_used < ?",
+                (cutoff,)
+            )
+            expired = [row[0] for row in cur.fetchall()]
+        
+        for thread_id in expired:
+            self.checkpointer.delete_thread(thread_id)
+        
+        with self.checkpointer.cursor() as cur:
+            cur.execute("DELETE FROM thread_activity WHERE last_used < ?", (cutoff,))
+        
+        if expired:
+            logger.info(f"🧹 Pruned {len(expired)} expired conversation threads")
+    
     def _init_graph_agent(self):
         """Initialize Graph database agent"""
-        self.graph_agent = GraphCypherQAChain.from_llm(
+        chain = GraphCypherQAChain.from_llm(
             llm=self.llm,
             graph=self.graph_db,
             validate_cypher=True,
             verbose=True,
-            allow_dangerous_requests=True
+            allow_dangerous_requests=True,
+            return_intermediate_steps=True
         )
         
+        # Repeated planned questions reuse their validated Cypher
+        self.graph_agent = CachedCypherQAChain(chain, self.graph_db, self._schema_hash)
+        
         self.graph_planner = GraphPlanner()
         
         logger.info("✅ Graph Agent initialized")
     
-    def query(self, question: str, thread_id: Optional[str] = None) -> Dict:
+    def query(
+        self,
+        question: str,
+        thread_id: Optional[str] = None,
+        stream: bool = False
+    ) -> Dict:
         """
         Execute a query using intelligent routing
         
         Args:
             question: User's question
             thread_id: Optional thread ID for conversation tracking
+            stream: Write SQL agent answers to stdout as soon as each model
+                turn without tool calls completes
             
         Returns:
             Dictionary with query results and metadata
@@ -161,31 +387,68 @@ class FundIntelligenceSystem:
         
         # Execute based on route
         if route == "SQL":
-            return self._execute_sql_query(question, thread_id)
+            return self._execute_sql_query(question, thread_id, stream=stream)
         else:
             return self._execute_graph_query(question)
     
-    def _execute_sql_query(self, question: str, thread_id: str) -> Dict:
+    def _run_sql_agent(self, inputs: Dict, config: Dict,
+                       printed: Optional[set] = None) -> Dict:
+        """
+        Run the SQL agent once, optionally writing answers to stdout
+        
+        With printed given, each model turn that ends without tool calls is
+        written out as soon as the model node finishes. Turns are held back
+        until then, so text the model emits before a tool call is never
+        shown; ids of written messages are added to printed, so a resumed
+        run does not repeat them.
+        
+        Args:
+            inputs: Agent input state
+            config: Run config (thread_id)
+            printed: Ids of messages already written; None disables output
+        
+        Returns:
+            Final agent state
+        """
+        if printed is None:
+            return self.sql_agent.invoke(inputs, config=config)
+        
+        result = {}
+        for state in self.sql_agent.stream(inputs, config=config, stream_mode="values"):
+            result = state
+            message = state["messages"][-1]
+            if (
+                isinstance(message, AIMessage)
+                and not message.tool_calls
+                and message.id not in printed
+                and isinstance(message.content, str)
+            ):
+                printed.add(message.id)
+                sys.stdout.write(message.content + "\n")
+                sys.stdout.flush()
+        
+        return result
+    
+    def _execute_sql_query(self, question: str, thread_id: str, stream: bool = False) -> Dict:
         """Execute SQL agent query"""
         logger.info("🗄️ Executing SQL Agent...")
         
         config = {"configurable": {"thread_id": thread_id}}
+        inputs = {"messages": [{"role": "user", "content": question}]}
+        
+        # Shared across the first and resumed runs, so nothing prints twice
+        printed = set() if stream else None
         
         try:
-            result = self.sql_agent.invoke(
-                {"messages": [{"role": "user", "content": question}]},
-                config=config
-            )
+            self._touch_thread(thread_id)
+            result = self._run_sql_agent(inputs, config, printed)
             
             # Handle human-in-the-loop if needed
             if result.get('__interrupt__'):
                 logger.info("⏸️ Human approval required")
                 # In production, implement approval workflow
                 # For now, auto-approve
-                result = self.sql_agent.invoke(
-                    {"messages": [{"role": "user", "content": question}]},
-                    config=config
-                )
+                result = self._run_sql_agent(inputs, config, printed)
             
             answer = result['messages'][-1].content
             
@@ -199,7 +462,8 @@ class FundIntelligenceSystem:
                 "route": "SQL",
                 "question": question,
                 "answer": answer,
-                "thread_id": thread_id
+                "thread_id": thread_id,
+                "streamed": bool(printed)
             }
             
         except Exception as e:
@@ -218,7 +482,7 @@ class FundIntelligenceSystem:
             # Plan the query
             planned_question = self.graph_planner.plan(
                 question,
-                self.graph_db.schema
+                self._cached_schema
             )
             
             # Execute query
@@ -227,7 +491,7 @@ class FundIntelligenceSystem:
             logger.info(f"\n{'='*60}")
             logger.info("GraphDB Query Result:")
             logger.info(f"{'='*60}")
-            logger.info(f"Cypher: {result.get('query', 'N/A')}")
+            logger.info(f"Cypher: {result.get('cypher') or 'N/A'} (cached: {result['cached']})")
             logger.info(f"Result: {result.get('result', 'N/A')}")
             logger.info(f"{'='*60}\n")
             
@@ -235,8 +499,8 @@ class FundIntelligenceSystem:
                 "route": "GraphDB",
                 "question": question,
                 "planned_question": planned_question,
-                "cypher": result.get('query', 'N/A'),
-                "answer": result.get('result', 'N/A')
+                "cypher": result.get('cypher') or 'N/A',
+                "answer": result.get('result') or 'N/A'
             }
             
         except Exception as e:
@@ -247,20 +511,218 @@ class FundIntelligenceSystem:
                 "error": str(e)
             }
     
-    def batch_query(self, questions: list) -> list:
+    async def aquery(
+        self,
+        question: str,
+        thread_id: Optional[str] = None,
+        speculative: bool = False
+    ) -> Dict:
         """
-        Execute multiple queries in batch
+        Async variant of query() using the agents' native ainvoke
+        
+        With speculative=True, the SQL and Graph agents start alongside the
+        router and the losing branch is dropped once the route is known.
+        This hides router latency at the cost of extra LLM tokens. Only the
+        SQL branch is truly cancelled (its async run stops at the next
+        await). The Graph branch's DSPy planner and Cypher chain are
+        blocking and cannot be stopped: when SQL wins, the Graph run still
+        completes on a throwaway thread nobody waits for, so every
+        SQL-routed speculative query also pays for a full planner, Cypher
+        generation and QA round. Speculation only applies to new
+        conversations: a cancelled SQL run would otherwise leave a stray
+        message in an existing thread's checkpoint. It is async-only, so
+        the per-loop async SQL agent is reused across calls.
+        
+        Args:
+            question: User's question
+            thread_id: Optional thread ID for conversation tracking
+            speculative: Overlap routing with both agents
+            
+        Returns:
+            Dictionary with query results and metadata
+        """
+        logger.info(f"Processing Query (async): {question}")
+        
+        if speculative and thread_id is None:
+            return await self._aquery_speculative(question, str(uuid.uuid4()))
+        
+        route = await self.router.aroute(question)
+        
+        if thread_id is None:
+            thread_id = str(uuid.uuid4())
+        
+        if route == "SQL":
+            return await self._aexecute_sql_query(question, thread_id)
+        else:
+            return await self._aexecute_graph_query(question)
+    
+    async def _aquery_speculative(self, question: str, thread_id: str) -> Dict:
+        """Run router and both agents concurrently, keep the routed result"""
+        route_task = asyncio.create_task(self.router.aroute(question))
+        
+        # The blocking Graph branch gets its own executor: asyncio.run joins
+        # the default executor on exit, which would make a losing Graph run
+        # delay the answer. shutdown(wait=False) still lets it finish.
+        graph_executor = ThreadPoolExecutor(max_workers=1)
+        branches = {
+            "SQL": asyncio.create_task(self._aexecute_sql_query(question, thread_id)),
+            "GraphDB": asyncio.get_running_loop().run_in_executor(
+                graph_executor, self._execute_graph_query, question
+            ),
+        }
+        graph_executor.shutdown(wait=False)
+        
+        try:
+            route = await route_task
+        except BaseException:
+            for task in branches.values():
+                task.cancel()
+            raise
+        
+        winner = branches.pop(route if route in branches else "SQL")
+        for task in branches.values():
+            task.cancel()
+        
+        return await winner
+    
+    async def _aexecute_sql_query(self, question: str, thread_id: str) -> Dict:
+        """Execute SQL agent query asynchronously"""
+        config = {"configurable": {"thread_id": thread_id}}
+        
+        try:
+            # Blocking sqlite3 write; keep it off the event loop
+            await asyncio.to_thread(self._touch_thread, thread_id)
+            sql_agent = await self._get_async_sql_agent()
+            result = await sql_agent.ainvoke(
+                {"messages": [{"role": "user", "content": question}]},
+                config=config
+            )
+            
+            return {
+                "route": "SQL",
+                "question": question,
+                "answer": result['messages'][-1].content,
+                "thread_id": thread_id
+            }
+            
+        except Exception as e:
+            logger.error(f"❌ SQL execution error: {e}")
+            return {
+                "route": "SQL",
+                "question": question,
+                "error": str(e)
+            }
+    
+    async def _aexecute_graph_query(self, question: str) -> Dict:
+        """Execute Graph database query asynchronously"""
+        try:
+            planned_question = await asyncio.to_thread(
+                self.graph_planner.plan,
+                question,
+                self._cached_schema
+            )
+            
+            result = await self.graph_agent.ainvoke({"query": planned_question})
+            
+            return {
+                "route": "GraphDB",
+                "question": question,
+                "planned_question": planned_question,
+                "cypher": result.get('cypher') or 'N/A',
+                "answer": result.get('result') or 'N/A'
+            }
+            
+        except Exception as e:
+            logger.error(f"❌ Graph execution error: {e}")
+            return {
+                "route": "GraphDB",
+                "question": question,
+                "error": str(e)
+            }
+    
+    def batch_query(
+        self,
+        questions: list,
+        max_workers: int = 8,
+        batch_size: Optional[int] = None,
+        delay_between_batches: float = 0.0
+    ) -> list:
+        """
+        Execute multiple queries concurrently
+        
+        Each question gets its own thread_id, so workers never share
+        checkpoint state.
+        
+        Args:
+            questions: List of questions
+            max_workers: Maximum number of queries in flight
+            batch_size: Optional number of questions per batch (rate limiting)
+            delay_between_batches: Seconds to sleep between batches
+            
+        Returns:
+            List of results, in the same order as questions
+        """
+        if not questions:
+            return []
+        
+        self._prune_checkpoints()
+        
+        batch_size = batch_size or len(questions)
+        results = []
+        
+        with ThreadPoolExecutor(max_workers=min(batch_size, max_workers)) as executor:
+            for start in range(0, len(questions), batch_size):
+                if start and delay_between_batches:
+                    time.sleep(delay_between_batches)
+                
+                batch = questions[start:start + batch_size]
+                results.extend(executor.map(self.query, batch))
+        
+        return results
+    
+    async def abatch_query(
+        self,
+        questions: list,
+        max_concurrency: int = 8,
+        batch_size: Optional[int] = None,
+        delay_between_batches: float = 0.0
+    ) -> list:
+        """
+        Execute multiple queries concurrently on the event loop
+        
+        At most max_concurrency queries are in flight at once, so a slow LLM
+        backend cannot pile up unbounded agent state in memory.
         
         Args:
             questions: List of questions
+            max_concurrency: Maximum number of queries in flight
+            batch_size: Optional number of questions per batch (rate limiting)
+            delay_between_batches: Seconds to sleep between batches
             
         Returns:
-            List of results
+            List of results, in the same order as questions
         """
+        if not questions:
+            return []
+        
+        await asyncio.to_thread(self._prune_checkpoints)
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def guarded(question: str) -> Dict:
+            async with semaphore:
+                return await self.aquery(question)
+        
+        batch_size = batch_size or len(questions)
         results = []
-        for question in questions:
-            result = self.query(question)
-            results.append(result)
+        
+        for start in range(0, len(questions), batch_size):
+            if start and delay_between_batches:
+                await asyncio.sleep(delay_between_batches)
+            
+            batch = questions[start:start + batch_size]
+            results.extend(await asyncio.gather(*(guarded(q) for q in batch)))
+        
         return results
 
 
@@ -293,12 +755,12 @@ def main():
             if not question:
                 continue
             
-            # Execute query
-            result = system.query(question)
+            # Execute query (SQL answers are printed as soon as they are ready)
+            result = system.query(question, stream=True)
             
             # Display result
             print(f"\n📊 Route: {result['route']}")
-            if 'answer' in result:
+            if 'answer' in result and not result.get('streamed'):
                 print(f"💡 Answer: {result['answer']}")
             elif 'error' in result:
                 print(f"❌ Error: {result['error']}")
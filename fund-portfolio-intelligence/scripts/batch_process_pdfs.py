@@ -3,17 +3,21 @@ Batch PDF Processing Script
 Process multiple PDF factsheets and load into Neo4j
 """
 
+import os
 import sys
-import json
 import logging
+import orjson
+import pandas as pd
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.core.pdf_extractor import FundPortfolioProcessor
-from src.database.neo4j_manager import FundPortfolioManager
+from src.core.data_cleaner import save_holdings
+from src.database.neo4j_manager import FundPortfolioManager, generate_fund_id
 from src.utils.config import get_settings
 
 logging.basicConfig(
@@ -23,16 +27,55 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def process_pdfs_in_directory(directory: Path, output_file: str = None):
+# Per-worker processor, built once by _init_worker
+_processor = None
+
+
+def _init_worker(allow_duplicates: bool = False):
+    """Process pool initializer: build one processor per worker"""
+    global _processor
+    _processor = FundPortfolioProcessor(allow_duplicates=allow_duplicates)
+
+
+def _process_one(pdf_path: str):
+    """
+    Process a single PDF inside a worker process
+    
+    Returns:
+        Tuple of (results, error message)
+    """
+    try:
+        return _processor.process_pdf(pdf_path), None
+    except Exception as e:
+        return None, str(e)
+    finally:
+        # Records are returned to the parent; don't keep a copy per worker
+        _processor.cleaner.clear_results()
+
+
+def process_pdfs_in_directory(
+    directory: Path,
+    output_file: str = None,
+    allow_duplicates: bool = False
+):
     """
     Process all PDFs in a directory
     
+    PDFs are processed in parallel worker processes (MAX_PARALLEL_PDF).
+    
     Args:
         directory: Directory containing PDF files
         output_file: Optional output JSON file
+        allow_duplicates: Keep repeated holdings within a fund's PDF
     """
-    # Find all PDFs
-    pdf_files = list(directory.glob("*.pdf"))
+    # Find all PDFs, largest first so the slowest files start earliest
+    with os.scandir(directory) as entries:
+        pdf_entries = [
+            entry for entry in entries
+            if entry.name.lower().endswith(".pdf") and entry.is_file()
+        ]
+    pdf_entries.sort(key=lambda entry: entry.stat().st_size, reverse=True)
+    pdf_files = [Path(entry.path) for entry in pdf_entries]
     
     if not pdf_files:
         logger.warning(f"No PDF files found in {directory}")
@@ -40,32 +83,36 @@ def process_pdfs_in_directory(directory: Path, output_file: str = None):
     
     logger.info(f"Found {len(pdf_files)} PDF files to process")
     
-    # Initialize processor
-    processor = FundPortfolioProcessor()
+    settings = get_settings()
+    max_workers = min(settings.max_parallel_pdf, len(pdf_files))
     
-    # Process each PDF
+    # Process PDFs in parallel
     all_results = {}
+    all_records = []
     
-    for pdf_path in pdf_files:
-        logger.info(f"\n{'='*60}")
-        logger.info(f"Processing: {pdf_path.name}")
-        logger.info(f"{'='*60}")
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(allow_duplicates,)
+    ) as executor:
+        outcomes = executor.map(_process_one, map(str, pdf_files))
         
-        try:
-            results = processor.process_pdf(str(pdf_path))
+        for pdf_path, (results, error) in zip(pdf_files, outcomes):
+            if error is not None:
+                logger.error(f"❌ Error processing {pdf_path.name}: {error}")
+                continue
+            
             all_results[pdf_path.name] = results
+            for fund_tables in results.values():
+                for records in fund_tables:
+                    all_records.extend(records)
             logger.info(f"✅ Successfully processed {pdf_path.name}")
-            
-        except Exception as e:
-            logger.error(f"❌ Error processing {pdf_path.name}: {e}")
-            continue
     
     # Save all results if output file specified
     if output_file:
-        settings = get_settings()
         output_path = Path(settings.processed_data_dir) / output_file
         
-        processor.cleaner.save_results(output_file)
+        save_holdings(all_records, output_file)
         logger.info(f"\n💾 All results saved to: {output_path}")
     
     return all_results
@@ -90,55 +137,69 @@ def load_json_to_neo4j(json_file: Path, year: int = None, month: int = None):
     logger.info(f"{'='*60}")
     
     # Load JSON
-    with open(json_file, 'r', encoding='utf-8') as f:
-        holdings_data = json.load(f)
+    with open(json_file, 'rb') as f:
+        holdings_data = orjson.loads(f.read())
     
     if not holdings_data:
         logger.warning("No data found in JSON file")
         return
     
-    # Group by fund
-    funds = {}
-    for holding in holdings_data:
-        fund_name = holding.get('fund_name', 'Unknown Fund')
-        if fund_name not in funds:
-            funds[fund_name] = []
-        funds[fund_name].append(holding)
+    # Group by fund (only the grouping columns go into the frame)
+    df = pd.DataFrame.from_records(holdings_data, columns=['fund_name', 'weights'])
+    fund_names = df['fund_name'].fillna('Unknown Fund')
+    groups = df.groupby(fund_names, sort=False)
     
-    logger.info(f"Found {len(funds)} funds with {len(holdings_data)} total holdings")
+    # Calculate total AUM per fund (placeholder - should come from factsheet)
+    weights = pd.to_numeric(df['weights'], errors='coerce').fillna(0.0)
+    total_aums = weights.groupby(fund_names, sort=False).sum() * 10
     
-    # Load each fund
+    logger.info(f"Found {groups.ngroups} funds with {len(holdings_data)} total holdings")
+    
+    # Build one payload per fund
+    portfolios = []
+    for fund_name, positions in groups.indices.items():
+        fund_holdings = [holdings_data[i] for i in positions]
+        
+        # Generate IDs
+        fund_id = generate_fund_id(fund_name)
+        snapshot_id = f"{year}{month:02d}{fund_id}"
+        
+        # Estimate AMC from fund name (simple heuristic)
+        amc = fund_name.split()[0] if fund_name else "Unknown"
+        
+        portfolios.append({
+            "fund_id": fund_id,
+            "fund_name": fund_name,
+            "amc": amc,
+            "snapshot_id": snapshot_id,
+            "year": year,
+            "month": month,
+            "total_aum": float(total_aums[fund_name]),
+            "holdings_data": fund_holdings,
+        })
+    
+    # Load all funds with batched UNWIND writes
     with FundPortfolioManager() as manager:
-        for fund_idx, (fund_name, fund_holdings) in enumerate(funds.items(), 1):
-            logger.info(f"\n[{fund_idx}/{len(funds)}] Loading: {fund_name}")
-            
-            # Generate IDs
-            fund_id = hash(fund_name) % (10**8)  # Generate consistent fund_id
-            snapshot_id = f"{year}{month:02d}{fund_id}"
-            
-            # Estimate AMC from fund name (simple heuristic)
-            amc = fund_name.split()[0] if fund_name else "Unknown"
+        # The loaders' MERGEs rely on the id constraints; a user without
+        # schema privileges can still load into an already set-up database
+        try:
+            manager.ensure_schema()
+        except Exception as e:
+            logger.warning(f"⚠️ Could not ensure Neo4j schema: {e}")
+        
+        try:
+            result = manager.load_portfolios_bulk(portfolios)
+            logger.info(
+                f"✅ Loaded {result['holdings_created']} holdings "
+                f"for {result['funds_loaded']} funds"
+            )
             
-            # Calculate total AUM (placeholder - should come from factsheet)
-            total_aum = sum(h.get('weights', 0) for h in fund_holdings) * 10
+            for fund_name in result['failed_funds']:
+                logger.error(f"❌ Error loading {fund_name}")
             
-            try:
-                result = manager.load_portfolio(
-                    fund_id=fund_id,
-                    fund_name=fund_name,
-                    amc=amc,
-                    snapshot_id=snapshot_id,
-                    year=year,
-                    month=month,
-                    total_aum=total_aum,
-                    holdings_data=fund_holdings
-                )
-                
-                logger.info(f"✅ Loaded {result['holdings_created']} holdings for {fund_name}")
-                
-            except Exception as e:
-                logger.error(f"❌ Error loading {fund_name}: {e}")
-                continue
+        except Exception as e:
+            logger.error(f"❌ Error loading portfolios: {e}")
+            return
     
     logger.info(f"\n✅ Neo4j loading complete")
 
@@ -176,6 +237,11 @@ def main():
         type=int,
         help='Month for snapshot (default: current month)'
     )
+    parser.add_argument(
+        '--allow-duplicates',
+        action='store_true',
+        help='Keep repeated holdings for the same fund instead of dropping them'
+    )
     
     args = parser.parse_args()
     
@@ -199,7 +265,9 @@ def main():
             sys.exit(1)
         
         # Process PDFs
-        results = process_pdfs_in_directory(input_dir, args.output_file)
+        results = process_pdfs_in_directory(
+            input_dir, args.output_file, allow_duplicates=args.allow_duplicates
+        )
         
         # Ask user if they want to load to Neo4j
         response = input("\n📊 Load processed data to Neo4j? (y/n): ").strip().lower()
@@ -26,36 +26,11 @@ def setup_neo4j():
     with FundPortfolioManager(
         uri=config.url,
         user=config.username,
-        password=config.password
+        password=config.password,
+        database=config.database
     ) as manager:
-        with manager.driver.session() as session:
-            # Create constraints
-            constraints = [
-                "CREATE CONSTRAINT fund_id_unique IF NOT EXISTS FOR (f:Fund) REQUIRE f.fund_id IS UNIQUE",
-                "CREATE CONSTRAINT instrument_id_unique IF NOT EXISTS FOR (i:Instrument) REQUIRE i.instrument_id IS UNIQUE",
-                "CREATE CONSTRAINT snapshot_id_unique IF NOT EXISTS FOR (s:MonthlySnapshot) REQUIRE s.snapshot_id IS UNIQUE",
-            ]
-            
-            for constraint in constraints:
-                try:
-                    session.run(constraint)
-                    logger.info(f"✅ Created constraint: {constraint[:50]}...")
-                except Exception as e:
-                    logger.warning(f"⚠️ Constraint may already exist: {e}")
-            
-            # Create indexes
-            indexes = [
-                "CREATE INDEX fund_name_index IF NOT EXISTS FOR (f:Fund) ON (f.fund_name)",
-                "CREATE INDEX instrument_name_index IF NOT EXISTS FOR (i:Instrument) ON (i.name)",
-                "CREATE INDEX snapshot_date_index IF NOT EXISTS FOR (s:MonthlySnapshot) ON (s.year, s.month)",
-            ]
-            
-            for index in indexes:
-                try:
-                    session.run(index)
-                    logger.info(f"✅ Created index: {index[:50]}...")
-                except Exception as e:
-                    logger.warning(f"⚠️ Index may already exist: {e}")
+        # Constraints and indexes (idempotent)
+        manager.ensure_schema()
     
     logger.info("✅ Neo4j setup complete")
 
@@ -146,6 +121,8 @@ def main():
         logger.info("Please check your .env file and try again")
         sys.exit(1)
     
+    settings = get_settings()
+    
     # Step 2: Setup directories
     setup_directories()
     
@@ -164,9 +141,9 @@ def main():
     logger.info("✅ Setup Complete!")
     logger.info("="*60)
     logger.info("\nNext Steps:")
-    logger.info("1. Place your ISIN master data CSV at: " + get_settings().isin_mapping_path)
-    logger.info("2. Place your SQLite database at: " + str(get_database_config().sqlite_path))
-    logger.info("3. Place PDF factsheets in: " + get_settings().raw_data_dir)
+    logger.info("1. Place your ISIN master data CSV at: " + settings.isin_mapping_path)
+    logger.info("2. Place your SQLite database at: " + settings.sqlite_db_path)
+    logger.info("3. Place PDF factsheets in: " + settings.raw_data_dir)
     logger.info("4. Run: python main.py")
     logger.info("\n")
 
@@ -0,0 +1,103 @@
+"""
+Cypher Cache Module
+Reuses previously generated Cypher for repeated graph questions
+"""
+
+import asyncio
+import hashlib
+from typing import Dict, Optional
+
+from langchain_neo4j import GraphCypherQAChain, Neo4jGraph
+
+from src.utils.cache import LRUCache
+
+
+CYPHER_CACHE_SIZE = 256
+
+
+class CachedCypherQAChain:
+    """
+    Thin wrapper around GraphCypherQAChain with a Cypher cache
+    
+    On a miss the wrapped chain runs as usual (Cypher generation, validation,
+    execution, answer) and the validated Cypher is stored under
+    (question, schema fingerprint). On a hit the Cypher-generation step is
+    skipped: the cached statement is run directly and only the answer
+    prompt is sent to the LLM.
+    """
+    
+    def __init__(
+        self,
+        chain: GraphCypherQAChain,
+        graph: Neo4jGraph,
+        schema_hash: str,
+        maxsize: int = CYPHER_CACHE_SIZE
+    ):
+        """
+        Initialize wrapper
+        
+        Args:
+            chain: Chain built with return_intermediate_steps=True
+            graph: Graph the chain queries
+            schema_hash: Fingerprint of the schema the chain was built with
+            maxsize: Maximum number of cached Cypher statements
+        """
+        self.chain = chain
+        self.graph = graph
+        self.schema_hash = schema_hash
+        self.cache = LRUCache(maxsize=maxsize)
+    
+    def _cache_key(self, question: str) -> str:
+        """Cache key for a (question, schema) pair"""
+        return hashlib.blake2b(
+            (question + self.schema_hash).encode("utf-8"),
+            digest_size=16
+        ).hexdigest()
+    
+    def _answer_from_cypher(self, question: str, cypher: str) -> Dict:
+        """Run cached Cypher and generate the answer (mirrors the chain)"""
+        context = self.graph.query(cypher)[: self.chain.top_k]
+        answer = self.chain.qa_chain.invoke({"question": question, "context": context})
+        if isinstance(answer, dict):
+            answer = answer.get(getattr(self.chain.qa_chain, "output_key", "text"))
+        
+        return {"query": question, "result": answer, "cypher": cypher, "cached": True}
+    
+    def _remember(self, key: str, question: str, result: Dict) -> Dict:
+        """Store the chain's validated Cypher and normalize its output"""
+        steps = result.get("intermediate_steps") or []
+        cypher: Optional[str] = steps[0].get("query") if steps else None
+        if cypher:
+            self.cache.set(key, cypher)
+        
+        return {"query": question, "result": result.get("result"), "cypher": cypher, "cached": False}
+    
+    def invoke(self, inputs: Dict) -> Dict:
+        """
+        Answer a graph question
+        
+        Args:
+            inputs: {"query": question}
+            
+        Returns:
+            Dict with query, result, cypher and cached flag
+        """
+        question = inputs["query"]
+        key = self._cache_key(question)
+        
+        cypher = self.cache.get(key)
+        if cypher is not None:
+            return self._answer_from_cypher(question, cypher)
+        
+        return self._remember(key, question, self.chain.invoke(inputs))
+    
+    async def ainvoke(self, inputs: Dict) -> Dict:
+        """Async variant of invoke()"""
+        question = inputs["query"]
+        key = self._cache_key(question)
+        
+        cypher = self.cache.get(key)
+        if cypher is not None:
+            return await asyncio.to_thread(self._answer_from_cypher, question, cypher)
+        
+        return self._remember(key, question, await self.chain.ainvoke(inputs))
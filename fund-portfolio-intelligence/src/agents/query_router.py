@@ -3,13 +3,70 @@ Query Router Module
 Intelligent query routing using DSPy for SQL vs GraphDB decisions
 """
 
+import re
+import asyncio
+import hashlib
 import dspy
-from typing import Literal
+from typing import Literal, Optional
 from pydantic import BaseModel, Field
 
+from src.utils.cache import LRUCache
 from src.utils.config import get_groq_config
 
 
+ROUTE_CACHE_SIZE = 1024
+PLAN_CACHE_SIZE = 256
+
+# Strong routing signals, mirroring the QueryRouter guidance below
+SQL_KEYWORDS = frozenset({
+    "return", "returns", "alpha", "beta", "sharpe", "benchmark", "benchmarks",
+    "screen", "screener", "screening", "rank", "ranking", "performance",
+    "performing", "cagr", "volatility", "nifty",
+})
+GRAPH_KEYWORDS = frozenset({
+    "portfolio", "portfolios", "holding", "holdings", "hold", "holds", "held",
+    "overlap", "overlapping", "position", "positions", "allocation", "amc",
+    "amcs", "stock", "stocks", "exposure", "co-occurrence",
+})
+
+# Keyword lead beyond which the LLM router is skipped
+KEYWORD_MARGIN = 2
+
+_WORD_RE = re.compile(r"[a-z][a-z\-]*")
+
+
+def normalize_question(question: str) -> str:
+    """Normalize a question for cache lookups (lowercase, collapse whitespace)"""
+    return " ".join(question.lower().split())
+
+
+def keyword_route(question: str) -> Optional[Literal["SQL", "GraphDB"]]:
+    """
+    Route on keywords alone when the signal is unambiguous
+    
+    Args:
+        question: User's query
+        
+    Returns:
+        "SQL" or "GraphDB" if one side leads by more than KEYWORD_MARGIN,
+        else None
+    """
+    words = _WORD_RE.findall(question.lower())
+    sql_score = sum(word in SQL_KEYWORDS for word in words)
+    graph_score = sum(word in GRAPH_KEYWORDS for word in words)
+    
+    if sql_score - graph_score > KEYWORD_MARGIN:
+        return "SQL"
+    if graph_score - sql_score > KEYWORD_MARGIN:
+        return "GraphDB"
+    return None
+
+
+def schema_fingerprint(schema: str) -> str:
+    """Stable short hash of a Neo4j schema string"""
+    return hashlib.blake2b(schema.encode("utf-8"), digest_size=16).hexdigest()
+
+
 # ============================================
 # Routing Models
 # ============================================
@@ -74,6 +131,13 @@ class IntelligentQueryRouter:
         
         # Initialize router
         self.router = dspy.Predict(QueryRouter)
+        
+        # Decisions are deterministic per question, so repeats skip the LLM
+        self.cache = LRUCache(maxsize=ROUTE_CACHE_SIZE)
+    
+    def clear_cache(self):
+        """Drop all cached routing decisions"""
+        self.cache.clear()
     
     def route(self, question: str) -> Literal["SQL", "GraphDB"]:
         """
@@ -85,6 +149,18 @@ class IntelligentQueryRouter:
         Returns:
             "SQL" or "GraphDB"
         """
+        cache_key = normalize_question(question)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            print(f"📊 Routing Decision (cached): {cached}")
+            return cached
+        
+        # Clear-cut questions don't need the LLM
+        decision = keyword_route(question)
+        if decision is not None:
+            print(f"📊 Routing Decision (keywords): {decision}")
+            return decision
+        
         try:
             result = self.router(question=question)
             
@@ -98,12 +174,18 @@ class IntelligentQueryRouter:
             print(f"📊 Routing Decision: {decision}")
             print(f"💭 Reasoning: {result.reasoning}")
             
+            # Only successful decisions are cached; the SQL fallback is not
+            self.cache.set(cache_key, decision)
             return decision
             
         except Exception as e:
             print(f"⚠️ Router error: {e}, defaulting to SQL")
             return "SQL"
     
+    async def aroute(self, question: str) -> Literal["SQL", "GraphDB"]:
+        """Async variant of route(); runs the blocking DSPy call in a thread"""
+        return await asyncio.to_thread(self.route, question)
+    
     def route_with_explanation(self, question: str) -> dict:
         """
         Route a query and return detailed explanation
@@ -190,6 +272,13 @@ class GraphPlanner:
             pass  # Already configured
         
         self.planner = dspy.Predict(GraphQueryPlanner)
+        
+        # Plans keyed by (normalized question, schema fingerprint)
+        self.cache = LRUCache(maxsize=PLAN_CACHE_SIZE)
+    
+    def clear_cache(self):
+        """Drop all cached plans (call whenever the graph schema changes)"""
+        self.cache.clear()
     
     def plan(self, question: str, schema: str) -> str:
         """
@@ -202,6 +291,12 @@ class GraphPlanner:
         Returns:
             Refined question aligned to schema
         """
+        cache_key = (normalize_question(question), schema_fingerprint(schema))
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            print(f"🎯 Planned Query (cached): {cached}")
+            return cached
+        
         try:
             result = self.planner(
                 user_question=question,
@@ -217,6 +312,7 @@ class GraphPlanner:
             print(f"🎯 Planned Query: {plan}")
             print(f"💭 Planning Reasoning: {result.reasoning}")
             
+            self.cache.set(cache_key, plan)
             return plan
             
         except Exception as e:
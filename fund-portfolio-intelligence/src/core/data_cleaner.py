@@ -4,18 +4,24 @@ LangGraph-based agent for cleaning and normalizing OCR table data
 """
 
 import os
+import re
+import sys
 import json
+import functools
+import threading
+import orjson
 import pandas as pd
 from collections import defaultdict
-from typing import Dict, List, Optional, TypedDict, Annotated
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Tuple, TypedDict, Annotated
 
 from langgraph.graph import StateGraph, END
 from langgraph.graph.message import add_messages
-from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage, SystemMessage
 
 from src.core.holding_classifier import TableCleanerCoT
-from src.utils.config import get_groq_config, get_data_config
+from src.utils.config import get_data_config
+from src.utils.llm import get_chat_groq
 
 
 # ============================================
@@ -28,16 +34,55 @@ class CleaningState(TypedDict):
     dataframe_input: Optional[pd.DataFrame]
     cleaned_json: Optional[List[Dict]]
     Data: Optional[List[Dict]]
-    Final_output: Optional[List[Dict]]
+    Final_output: Optional[List["HoldingRecord"]]
     validation_errors: List[str]
     messages: Annotated[List, add_messages]
     fund_name: Optional[str]
 
 
+# ============================================
+# Holding Record
+# ============================================
+
+@dataclass
+class HoldingRecord:
+    """One cleaned holding row (slotted: no per-instance dict)"""
+    __slots__ = (
+        "fund_name", "name", "stock_id", "weights",
+        "market_cap", "asset_class", "sub_type",
+    )
+    
+    fund_name: Optional[str]
+    name: Optional[str]
+    stock_id: Optional[str]
+    weights: Optional[float]
+    market_cap: Optional[str]
+    asset_class: Optional[str]
+    sub_type: Optional[str]
+
+
+# Low-cardinality columns stored as categoricals in to_records()
+_CATEGORY_COLUMNS = ("fund_name", "asset_class", "sub_type", "market_cap")
+
+
 # ============================================
 # ISIN Mapper
 # ============================================
 
+# "ltd" / "ltd." as a whole word -> "limited"
+_LTD_RE = re.compile(r'\bltd\b\.?')
+
+
+@functools.lru_cache(maxsize=4096)
+def normalize_company_name(name: str) -> str:
+    """
+    Normalize a company name into an ISIN lookup key
+    
+    Cached: the same few hundred stock names recur across every fund.
+    """
+    return _LTD_RE.sub('limited', name.strip().lower().replace('&amp;', '&'))
+
+
 class ISINMapper:
     """Maps stock names to ISIN codes using master data"""
     
@@ -48,8 +93,8 @@ class ISINMapper:
         Args:
             mapping_path: Path to ISIN mapping CSV. If None, loads from config
         """
-        self.isin_mapping = {}
-        self.market_cap_mapping = {}
+        # normalized company name -> (ISIN, market cap)
+        self.mapping: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
         
         if mapping_path is None:
             config = get_data_config()
@@ -67,25 +112,34 @@ class ISINMapper:
             df = pd.read_csv(path, encoding='latin1')
             df.columns = df.columns.str.strip()
             
-            for _, row in df.iterrows():
-                company_name = str(row.get('NAME OF COMPANY', '')).strip().lower()
-                # Normalize company name
-                company_name = (
-                    company_name
-                    .replace('&amp;', '&')
-                    .replace('Ltd.', 'limited')
-                    .replace('Ltd', 'limited')
-                )
-                
-                isin = str(row.get('ISIN NUMBER', '')).strip()
-                market_cap = str(row.get('MARKET CAP', '')).strip()
-                
-                if company_name and isin:
-                    self.isin_mapping[company_name] = isin
-                if company_name and market_cap:
-                    self.market_cap_mapping[company_name] = market_cap
+            # Normalize all columns at once (same rules as lookups);
+            # missing columns/values become empty strings
+            empty = pd.Series('', index=df.index)
+            company_names = (
+                df.get('NAME OF COMPANY', empty).fillna('').astype(str)
+                .str.strip()
+                .str.lower()
+                .str.replace('&amp;', '&', regex=False)
+                .str.replace(_LTD_RE, 'limited', regex=True)
+            )
+            isins = df.get('ISIN NUMBER', empty).fillna('').astype(str).str.strip()
+            market_caps = df.get('MARKET CAP', empty).fillna('').astype(str).str.strip()
+            
+            has_isin = isins.ne('')
+            has_market_cap = market_caps.ne('')
+            keep = company_names.ne('') & (has_isin | has_market_cap)
+            
+            # One entry per company; blanks become None
+            self.mapping = dict(zip(
+                company_names[keep],
+                zip(
+                    isins.where(has_isin, None)[keep],
+                    market_caps.where(has_market_cap, None)[keep],
+                ),
+            ))
             
-            print(f"✅ Loaded {len(self.isin_mapping)} ISIN mappings")
+            num_isins = sum(1 for isin, _ in self.mapping.values() if isin)
+            print(f"✅ Loaded {num_isins} ISIN mappings")
             
         except Exception as e:
             print(f"❌ Error loading ISIN mapping: {e}")
@@ -100,44 +154,62 @@ class ISINMapper:
         Returns:
             ISIN code or None if not found
         """
-        if not stock_name or not self.isin_mapping:
+        if not stock_name or not self.mapping:
             return None
         
-        # Normalize search key
-        search_key = stock_name.strip().lower()
-        search_key = (
-            search_key
-            .replace('&amp;', '&')
-            .replace('ltd.', 'limited')
-            .replace('ltd', 'limited')
-        )
-        
-        isin = self.isin_mapping.get(search_key)
+        entry = self.mapping.get(normalize_company_name(stock_name))
+        isin = entry[0] if entry else None
         if not isin:
             print(f"⚠️ ISIN not found for '{stock_name}'")
         
         return isin
     
+    def lookup(self, stock_name: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Map a stock name to both its ISIN and market cap
+        
+        Normalizes the name once for both lookups.
+        
+        Args:
+            stock_name: Company name
+            
+        Returns:
+            Tuple of (ISIN, market cap); either may be None
+        """
+        if not stock_name:
+            return None, None
+        
+        isin, market_cap = self.mapping.get(
+            normalize_company_name(stock_name), (None, None)
+        )
+        if not isin and self.mapping:
+            print(f"⚠️ ISIN not found for '{stock_name}'")
+        
+        return isin, market_cap
+    
     def get_market_cap(self, stock_name: str) -> Optional[str]:
         """Get market cap for a stock"""
-        if not stock_name or not self.market_cap_mapping:
+        if not stock_name or not self.mapping:
             return None
         
-        search_key = stock_name.strip().lower()
-        search_key = (
-            search_key
-            .replace('&amp;', '&')
-            .replace('ltd.', 'limited')
-            .replace('ltd', 'limited')
-        )
-        
-        return self.market_cap_mapping.get(search_key)
+        entry = self.mapping.get(normalize_company_name(stock_name))
+        return entry[1] if entry else None
 
 
 # ============================================
 # Data Cleaning Agent
 # ============================================
 
+# Only these holdings carry an ISIN in the master data
+_EQUITY_CLASS = "EQUITY & EQUITY RELATED"
+_EQUITY_SUBTYPES = frozenset({"Indian Equity", "Foreign Equity"})
+
+
+def _intern(value):
+    """Intern low-cardinality string fields so output rows share one object"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
 class DataCleaningAgent:
     """LangGraph agent for OCR table normalization"""
     
@@ -145,7 +217,10 @@ class DataCleaningAgent:
         self, 
         llm_model: Optional[str] = None,
         temperature: float = 0.1,
-        isin_mapping_path: Optional[str] = None
+        isin_mapping_path: Optional[str] = None,
+        output_stream: Optional[str] = None,
+        use_graph: bool = False,
+        allow_duplicates: bool = False
     ):
         """
         Initialize data cleaning agent
@@ -154,18 +229,17 @@ class DataCleaningAgent:
             llm_model: Optional LLM model name
             temperature: LLM temperature
             isin_mapping_path: Path to ISIN mapping file
+            output_stream: Optional JSONL path. If set, cleaned records are
+                appended there as each table finishes instead of being
+                accumulated in memory
+            use_graph: Run tables through the compiled LangGraph app instead
+                of calling the three nodes directly
+            allow_duplicates: Keep repeated (fund, holding, sub_type, weight) rows
+                instead of dropping them
         """
-        # Get configuration
-        config = get_groq_config()
-        if llm_model is None:
-            llm_model = config.model
-        
-        # Initialize LLM
-        self.llm = ChatGroq(
-            model=llm_model,
-            temperature=temperature,
-            api_key=config.api_key
-        )
+        # LLM clients are created lazily on first use
+        self._llm_model = llm_model
+        self._temperature = temperature
         
         # Initialize ISIN mapper
         self.isin_mapper = ISINMapper(isin_mapping_path)
@@ -174,10 +248,25 @@ class DataCleaningAgent:
         self.graph = self._build_graph()
         self.app = self.graph.compile()
         
+        # The pipeline is strictly linear, so by default skip graph dispatch
+        self._fast_path = not use_graph
+        
         # Accumulated results for batch processing
         self.accumulated_results = []
         
+        # (fund_name, name, sub_type) keys already emitted, for dedup
+        self._dedup = not allow_duplicates
+        self._seen = set()
+        self._seen_lock = threading.Lock()
+        
+        # Optional JSONL sink (tables may be cleaned from worker threads)
+        self._stream_path = output_stream
+        self._stream_lock = threading.Lock()
+        if output_stream:
+            os.makedirs(os.path.dirname(os.path.abspath(output_stream)), exist_ok=True)
+        
         self.system_prompt = """You are a table normalizer for OCR data.
+        The table is given as pipe-separated rows, one row per line.
         Reconstruct the table with these columns:
         - Stock Name
         - pct_total_aum
@@ -188,6 +277,16 @@ class DataCleaningAgent:
         • Consider Gross Exposure,% to Net Assets as pct_total_aum if present.
         • Output JSON array only, no explanations."""
     
+    @functools.cached_property
+    def llm(self):
+        """Shared ChatGroq client, created on first use"""
+        return get_chat_groq(self._llm_model, self._temperature)
+    
+    @functools.cached_property
+    def classifier(self) -> TableCleanerCoT:
+        """Table classifier (DSPy program), created on first use"""
+        return TableCleanerCoT()
+    
     def _build_graph(self) -> StateGraph:
         """Build the LangGraph workflow"""
         workflow = StateGraph(CleaningState)
@@ -211,17 +310,23 @@ class DataCleaningAgent:
         """Extract text from DataFrame"""
         df = state.get("dataframe_input")
         if df is not None:
-            state["raw_data"] = df.to_markdown(index=False)
+            # Pipe-separated rows: fewer tokens than a padded markdown table.
+            # OCR tables carry their header in the first row, so positional
+            # column labels are dropped.
+            state["raw_data"] = df.to_csv(
+                index=False,
+                header=not isinstance(df.columns, pd.RangeIndex),
+                sep='|'
+            )
             print(f"📝 Extracted text:\n{state['raw_data'][:200]}...")
         return state
     
     def normalize_node(self, state: CleaningState) -> CleaningState:
         """Normalize table using LLM"""
         raw_input = state['raw_data']
-        classifier = TableCleanerCoT()
         
         try:
-            result = classifier.clean_and_parse(raw_input)
+            result = self.classifier.clean_and_parse(raw_input)
             state["cleaned_json"] = result
             print(f"✅ Normalized: {len(result)} groups")
         except Exception as e:
@@ -233,41 +338,70 @@ class DataCleaningAgent:
     def to_dataframe_node(self, state: CleaningState) -> CleaningState:
         """Transform normalized data to final format"""
         refined_data = state.get("cleaned_json", [])
-        fund_name = state.get("fund_name", "Unknown Fund")
+        fund_name = _intern(state.get("fund_name", "Unknown Fund"))
         final_output = []
+        duplicates = 0
         
         if refined_data:
             for group in refined_data:
                 # Extract parent info
-                asset_class = group.get("group_name")
-                sub_type = group.get("sub_group")
+                asset_class = _intern(group.get("group_name"))
+                sub_type = _intern(group.get("sub_group"))
+                
+                # Only look up ISIN for equity instruments
+                is_equity = (
+                    asset_class == _EQUITY_CLASS
+                    and sub_type in _EQUITY_SUBTYPES
+                )
                 
                 # Process individual items and flatten
                 for item in group.get("items", []):
                     stock_name = item.get("name")
+                    weight = item.get("percentage_to_net_assets")
+                    
+                    # Skip rows already emitted for this fund; the weight is
+                    # part of the key so distinct same-name lines (e.g. several
+                    # bonds of one issuer) are kept
+                    if self._dedup:
+                        key = (fund_name, stock_name, sub_type, weight)
+                        with self._seen_lock:
+                            if key in self._seen:
+                                duplicates += 1
+                                continue
+                            self._seen.add(key)
                     
-                    # Only look up ISIN for equity instruments
-                    isin = None
-                    if asset_class == "EQUITY & EQUITY RELATED":
-                        if sub_type in ["Indian Equity", "Foreign Equity"]:
-                            isin = self.isin_mapper.map_stock_to_isin(stock_name)
+                    if is_equity:
+                        isin, market_cap = self.isin_mapper.lookup(stock_name)
+                    else:
+                        isin, market_cap = None, self.isin_mapper.get_market_cap(stock_name)
                     
-                    new_item = {
-                        "fund_name": fund_name,
-                        "name": stock_name,
-                        "stock_id": isin,
-                        "weights": item.get("percentage_to_net_assets"),
-                        "market_cap": self.isin_mapper.get_market_cap(stock_name),
-                        "asset_class": asset_class,
-                        "sub_type": sub_type
-                    }
+                    new_item = HoldingRecord(
+                        fund_name=fund_name,
+                        name=stock_name,
+                        stock_id=isin,
+                        weights=weight,
+                        market_cap=market_cap,
+                        asset_class=asset_class,
+                        sub_type=sub_type
+                    )
                     
                     final_output.append(new_item)
             
             print(f"✅ Transformed {len(final_output)} items for {fund_name}")
+            if duplicates:
+                print(f"⚠️ Dropped {duplicates} duplicate rows for {fund_name}")
             
-            # Accumulate for batch saving
-            self.accumulated_results.extend(final_output)
+            if self._stream_path:
+                # Append as JSONL so memory stays bounded by one table
+                lines = b"".join(
+                    orjson.dumps(item, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n"
+                    for item in final_output
+                )
+                with self._stream_lock, open(self._stream_path, 'ab') as f:
+                    f.write(lines)
+            else:
+                # Accumulate for batch saving
+                self.accumulated_results.extend(final_output)
         
         state["Final_output"] = final_output
         return state
@@ -276,7 +410,7 @@ class DataCleaningAgent:
         self, 
         df: pd.DataFrame, 
         fund_name: Optional[str] = None
-    ) -> List[Dict]:
+    ) -> List[HoldingRecord]:
         """
         Clean a single DataFrame
         
@@ -298,9 +432,45 @@ class DataCleaningAgent:
             "fund_name": fund_name
         }
         
-        final = self.app.invoke(init_state)
+        if self._fast_path:
+            state = self.extract_text_node(init_state)
+            state = self.normalize_node(state)
+            final = self.to_dataframe_node(state)
+        else:
+            final = self.app.invoke(init_state)
+        
         return final.get("Final_output", [])
     
+    def to_records(self) -> pd.DataFrame:
+        """
+        Convert accumulated results to a DataFrame
+        
+        Returns:
+            DataFrame with one row per holding; repeated text columns
+            are categoricals
+        """
+        columns = HoldingRecord.__slots__
+        df = pd.DataFrame(
+            [[getattr(record, col) for col in columns] for record in self.accumulated_results],
+            columns=list(columns)
+        )
+        return df.astype({col: "category" for col in _CATEGORY_COLUMNS})
+    
+    def reset_dedup(self):
+        """
+        Forget which rows were already emitted
+        
+        Call at the start of each source document: dedup only drops rows
+        repeated within one document, never a later month's identical rows.
+        """
+        with self._seen_lock:
+            self._seen.clear()
+    
+    def clear_results(self):
+        """Drop accumulated results and the dedup history"""
+        self.accumulated_results = []
+        self.reset_dedup()
+    
     def save_results(self, output_file: str):
         """
         Save accumulated results to JSON file
@@ -308,21 +478,36 @@ class DataCleaningAgent:
         Args:
             output_file: Path to output file
         """
-        # Get output directory from config
-        config = get_data_config()
-        output_path = config.processed_data_dir / output_file
-        
-        # Ensure directory exists
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Save JSON
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(self.accumulated_results, f, indent=2, ensure_ascii=False)
+        if self._stream_path:
+            print(f"💾 Results already streamed to {self._stream_path}")
+            return
         
-        print(f"💾 Saved {len(self.accumulated_results)} items to {output_path}")
+        save_holdings(self.accumulated_results, output_file)
         
         # Reset accumulator
-        self.accumulated_results = []
+        self.clear_results()
+
+
+def save_holdings(records: List[HoldingRecord], output_file: str):
+    """
+    Save cleaned holding records to a JSON file in the processed data dir
+    
+    Args:
+        records: Cleaned holding records
+        output_file: Output filename
+    """
+    # Get output directory from config
+    config = get_data_config()
+    output_path = config.processed_data_dir / output_file
+    
+    # Ensure directory exists
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    # Save JSON
+    with open(output_path, 'wb') as f:
+        f.write(orjson.dumps(records, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    
+    print(f"💾 Saved {len(records)} items to {output_path}")
 
 
 # ============================================
@@ -340,4 +525,4 @@ if __name__ == "__main__":
     result = agent.clean_dataframe(sample_df, fund_name="Test Fund")
     
     print("\nCleaned Output:")
-    print(json.dumps(result, indent=2))
+    print(json.dumps([asdict(record) for record in result], indent=2))
@@ -3,9 +3,12 @@ Holding Classifier Module
 Classifies portfolio holdings into asset classes and sub-types using LLM
 """
 
+import re
+import functools
 import dspy
 import json
-from typing import List, Literal, Dict
+import orjson
+from typing import List, Literal, Dict, FrozenSet
 from pydantic import BaseModel, Field
 from src.utils.config import get_groq_config
 
@@ -53,6 +56,12 @@ GROUP_SUBGROUP_MAP: Dict[str, List[str]] = {
     "OTHER": ['Commodity']
 }
 
+# Same taxonomy as frozensets for O(1) membership checks
+GROUP_SUBGROUP_SET: Dict[str, FrozenSet[str]] = {
+    group: frozenset(subgroups)
+    for group, subgroups in GROUP_SUBGROUP_MAP.items()
+}
+
 # Type definitions
 GroupName = Literal[
     "EQUITY & EQUITY RELATED",
@@ -138,7 +147,7 @@ class CleanGroupedTable(dspy.Signature):
     """
 
     table_input: str = dspy.InputField(
-        desc="Raw OCR text or markdown table"
+        desc="Raw OCR text or pipe-separated table rows"
     )
 
     json_output: str = dspy.OutputField(
@@ -161,6 +170,20 @@ class CleanGroupedTable(dspy.Signature):
 # Table Cleaner Module
 # ============================================
 
+@functools.lru_cache(maxsize=None)
+def _get_lm(model: str, api_key: str, temperature: float) -> dspy.LM:
+    """Shared DSPy LM, one per model/key/temperature"""
+    return dspy.LM(
+        model=f"groq/{model}",
+        api_key=api_key,
+        temperature=temperature
+    )
+
+
+# Body of a ```json ... ``` or ``` ... ``` fenced block
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.DOTALL)
+
+
 class TableCleanerCoT(dspy.Module):
     """Chain-of-Thought table cleaner using DSPy"""
     
@@ -171,20 +194,16 @@ class TableCleanerCoT(dspy.Module):
         if config is None:
             config = get_groq_config()
         
-        # Configure DSPy with Groq
-        lm = dspy.LM(
-            model=f"groq/{config.model}",
-            api_key=config.api_key,
-            temperature=config.temperature
-        )
-        dspy.configure(lm=lm)
+        # DSPy LM for Groq; bound per call so instances can run in worker threads
+        self.lm = _get_lm(config.model, config.api_key, config.temperature)
         
         # Initialize chain of thought
         self.prog = dspy.ChainOfThought(CleanGroupedTable)
 
     def forward(self, table_input: str):
         """Process table input and return cleaned output"""
-        return self.prog(table_input=table_input)
+        with dspy.context(lm=self.lm):
+            return self.prog(table_input=table_input)
     
     def clean_and_parse(self, table_input: str) -> List[Dict]:
         """
@@ -200,17 +219,15 @@ class TableCleanerCoT(dspy.Module):
         
         try:
             # Extract JSON from markdown if present
-            json_str = result.json_output.strip()
-            if json_str.startswith('```json'):
-                json_str = json_str.split('```json')[1].split('```')[0]
-            elif json_str.startswith('```'):
-                json_str = json_str.split('```')[1].split('```')[0]
+            output = result.json_output
+            match = _FENCE_RE.search(output)
+            json_str = match.group(1) if match else output.strip()
             
             # Parse JSON
-            parsed_data = json.loads(json_str.strip())
+            parsed_data = orjson.loads(json_str)
             return parsed_data
             
-        except (json.JSONDecodeError, AttributeError, IndexError) as e:
+        except (orjson.JSONDecodeError, AttributeError, TypeError) as e:
             print(f"⚠️ Failed to parse JSON output: {e}")
             return []
 
@@ -230,8 +247,7 @@ def validate_asset_classification(group_name: str, sub_group: str) -> bool:
     Returns:
         True if valid combination
     """
-    valid_subgroups = GROUP_SUBGROUP_MAP.get(group_name, [])
-    return sub_group in valid_subgroups
+    return sub_group in GROUP_SUBGROUP_SET.get(group_name, frozenset())
 
 
 def get_valid_subgroups(group_name: str) -> List[str]:
@@ -3,14 +3,21 @@ PDF Extractor Module
 Extracts tables from PDF factsheets using Azure Document Intelligence
 """
 
-import base64
+import re
+import numpy as np
 import pandas as pd
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 from azure.core.credentials import AzureKeyCredential
 from azure.ai.documentintelligence import DocumentIntelligenceClient
+from azure.ai.documentintelligence.models import AnalyzeDocumentRequest
 
-from src.utils.config import get_azure_config
+from src.utils.config import get_azure_config, get_settings
+
+
+# Lines mentioning a fund anchor the fund name on a page
+_FUND_RE = re.compile(r'fund', re.IGNORECASE)
 
 
 class PDFTableExtractor:
@@ -31,20 +38,6 @@ class PDFTableExtractor:
             credential=AzureKeyCredential(config.key)
         )
     
-    def _load_file_as_base64(self, file_path: str) -> str:
-        """
-        Convert PDF to base64 string for Azure request
-        
-        Args:
-            file_path: Path to PDF file
-            
-        Returns:
-            Base64 encoded string
-        """
-        with open(file_path, "rb") as f:
-            data = f.read()
-        return base64.b64encode(data).decode("utf-8")
-    
     def extract_tables(self, file_path: str) -> Dict[str, List[pd.DataFrame]]:
         """
         Extract tables from PDF and group them by detected fund name
@@ -57,12 +50,16 @@ class PDFTableExtractor:
         """
         print(f"📄 Extracting tables from: {file_path}")
         
-        # Start analysis
+        # Start analysis (raw bytes, no base64 round-trip)
+        with open(file_path, "rb") as f:
+            data = f.read()
+        
         poller = self.client.begin_analyze_document(
             "prebuilt-layout",
-            {"base64Source": self._load_file_as_base64(file_path)}
+            AnalyzeDocumentRequest(bytes_source=data)
         )
         result = poller.result()
+        page_by_num = {page.page_number: page for page in result.pages}
         
         print(f"✅ Found {len(result.pages)} pages and {len(result.tables)} tables.\n")
         
@@ -75,12 +72,13 @@ class PDFTableExtractor:
             )
             rows, cols = table.row_count, table.column_count
             
-            # Create empty DataFrame
-            df = pd.DataFrame([[""] * cols for _ in range(rows)])
-            
-            # Fill DataFrame with cell content
-            for cell in table.cells:
-                df.iat[cell.row_index, cell.column_index] = str(cell.content).strip()
+            # Fill a blank grid with cell content in one vectorized assignment
+            cells = table.cells
+            grid = np.full((rows, cols), "", dtype=object)
+            row_idx = np.fromiter((c.row_index for c in cells), dtype=np.intp, count=len(cells))
+            col_idx = np.fromiter((c.column_index for c in cells), dtype=np.intp, count=len(cells))
+            grid[row_idx, col_idx] = [str(c.content).strip() for c in cells]
+            df = pd.DataFrame(grid)
             
             tables_by_page[page_number].append((table_idx, df))
         
@@ -89,28 +87,32 @@ class PDFTableExtractor:
         
         for page, tables in sorted(tables_by_page.items()):
             # Detect fund name from page text
-            fund_name = self._detect_fund_name(result.pages, page)
+            fund_name = self._detect_fund_name(page_by_num.get(page))
             
             # Merge consecutive tables with same headers
             i = 0
             while i < len(tables):
                 table_idx, df = tables[i]
-                merged_df = df.copy()
+                chunks = [df]
+                base_header = tuple(df.iloc[0].to_numpy().tolist())
                 
                 # Look for continuation tables
                 j = i + 1
                 while j < len(tables):
                     next_idx, next_df = tables[j]
-                    if tuple(df.iloc[0].values) == tuple(next_df.iloc[0].values):
-                        # Same headers - merge
-                        merged_df = pd.concat(
-                            [merged_df, next_df.iloc[1:]], 
-                            ignore_index=True
-                        )
+                    if base_header == tuple(next_df.iloc[0].to_numpy().tolist()):
+                        # Same headers - collect rows below the header
+                        chunks.append(next_df.iloc[1:])
                         j += 1
                     else:
                         break
                 
+                # Concatenate once so merging stays linear in the number of tables
+                merged_df = (
+                    pd.concat(chunks, ignore_index=True)
+                    if len(chunks) > 1 else df.copy()
+                )
+                
                 if fund_name:
                     merged_tables_by_fund[fund_name].append(merged_df)
                 
@@ -118,46 +120,45 @@ class PDFTableExtractor:
         
         return merged_tables_by_fund
     
-    def _detect_fund_name(self, pages: List, page_number: int) -> Optional[str]:
+    def _detect_fund_name(self, page) -> Optional[str]:
         """
         Detect fund name from page text
         
         Args:
-            pages: List of page objects from Azure result
-            page_number: Page number to analyze
+            page: Page object from Azure result (or None if not found)
             
         Returns:
             Detected fund name or None
         """
+        if page is None:
+            return None
+        
         fund_name = None
+        lines = page.lines or []
         
-        for page in pages:
-            if page.page_number == page_number:
-                for idx, line in enumerate(page.lines):
-                    if "fund" in line.content.lower():
-                        # Found line with "fund" keyword
-                        current_line = line.content.strip()
-                        
-                        # Check if there's a line above
-                        if idx > 0:
-                            previous_line = page.lines[idx - 1].content.strip()
-                            # Combine previous line and current line
-                            fund_name = f"{previous_line} {current_line}"
-                        else:
-                            # No line above, just use current line
-                            fund_name = current_line
-                        
-                        # Clean up extra spaces
-                        fund_name = " ".join(fund_name.split())
-                        break
+        for idx, line in enumerate(lines):
+            if _FUND_RE.search(line.content):
+                # Found line with "fund" keyword
+                current_line = line.content.strip()
                 
-                # Fallback: if no "fund" keyword found, use first line
-                if not fund_name and page.lines:
-                    fund_name = page.lines[0].content.strip()
+                # Check if there's a line above
+                if idx > 0:
+                    previous_line = lines[idx - 1].content.strip()
+                    # Combine previous line and current line
+                    fund_name = f"{previous_line} {current_line}"
+                else:
+                    # No line above, just use current line
+                    fund_name = current_line
                 
-                print(f"📄 Page {page_number}: Detected fund name: '{fund_name}'")
+                # Clean up extra spaces
+                fund_name = " ".join(fund_name.split())
                 break
         
+        # Fallback: if no "fund" keyword found, use first line
+        if not fund_name and lines:
+            fund_name = lines[0].content.strip()
+        
+        print(f"📄 Page {page.page_number}: Detected fund name: '{fund_name}'")
         return fund_name
 
 
@@ -167,24 +168,35 @@ class FundPortfolioProcessor:
     Combines PDF extraction with data cleaning
     """
     
-    def __init__(self):
-        """Initialize processor with extractor and cleaner"""
+    def __init__(self, allow_duplicates: bool = False):
+        """
+        Initialize processor with extractor and cleaner
+        
+        Args:
+            allow_duplicates: Keep repeated holdings for the same fund
+        """
         from src.core.data_cleaner import DataCleaningAgent
         
         self.extractor = PDFTableExtractor()
-        self.cleaner = DataCleaningAgent()
+        self.cleaner = DataCleaningAgent(allow_duplicates=allow_duplicates)
     
     def process_pdf(
         self, 
         file_path: str, 
-        output_file: Optional[str] = None
+        output_file: Optional[str] = None,
+        max_workers: Optional[int] = None
     ) -> Dict[str, List[pd.DataFrame]]:
         """
         Full pipeline: extract tables → clean via LLM
         
+        Tables are cleaned concurrently since each one is an
+        independent, network-bound LLM call.
+        
         Args:
             file_path: Path to PDF file
             output_file: Optional output JSON file path
+            max_workers: Maximum concurrent cleaning calls.
+                If None, uses MAX_PARALLEL_TABLES from settings
             
         Returns:
             Dictionary mapping fund names to cleaned DataFrames
@@ -192,15 +204,28 @@ class FundPortfolioProcessor:
         # Step 1: Extract tables
         all_fund_tables = self.extractor.extract_tables(file_path)
         
-        # Step 2: Clean tables
-        cleaned_results = {}
+        # Step 2: Clean tables (duplicates are only dropped within this PDF)
+        self.cleaner.reset_dedup()
+        jobs = [
+            (fund, df)
+            for fund, tables in all_fund_tables.items()
+            for df in tables
+        ]
+        cleaned_results = {fund: [] for fund in all_fund_tables}
         
-        for fund, tables in all_fund_tables.items():
-            cleaned_results[fund] = []
-            for df in tables:
+        if jobs:
+            if max_workers is None:
+                max_workers = get_settings().max_parallel_tables
+            
+            def clean(job):
+                fund, df = job
                 print(f"\n🧩 Cleaning table for fund: {fund}")
-                cleaned_df = self.cleaner.clean_dataframe(df, fund_name=fund)
-                cleaned_results[fund].append(cleaned_df)
+                return self.cleaner.clean_dataframe(df, fund_name=fund)
+            
+            # map() preserves job order, so tables stay in document order
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+                for (fund, _), cleaned_df in zip(jobs, executor.map(clean, jobs)):
+                    cleaned_results[fund].append(cleaned_df)
         
         # Step 3: Save if output file specified
         if output_file:
@@ -3,9 +3,15 @@ Neo4j Database Manager
 Manages fund portfolio data in Neo4j graph database
 """
 
+import asyncio
+import atexit
+import functools
+import hashlib
 import logging
-from typing import Dict, List, Optional
-from neo4j import GraphDatabase
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+from neo4j import AsyncGraphDatabase, GraphDatabase, WRITE_ACCESS
+from neo4j.exceptions import ClientError
 from datetime import date
 
 from src.utils.config import get_neo4j_config
@@ -14,11 +20,284 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def generate_fund_id(fund_name: str) -> int:
+    """
+    Derive a stable fund identifier from the fund name
+    
+    Unlike the built-in hash(), this is identical across interpreter runs
+    (no PYTHONHASHSEED randomization), so reloads MERGE onto the same Fund.
+    
+    Args:
+        fund_name: Fund name (case and surrounding whitespace are ignored)
+    
+    Returns:
+        Non-negative 63-bit integer (fits Neo4j's signed 64-bit INTEGER)
+    """
+    key = " ".join(fund_name.split()).lower().encode("utf-8")
+    digest = hashlib.blake2b(key, digest_size=8).digest()
+    return int.from_bytes(digest, "big") >> 1
+
+
+# ============================================
+# Shared Queries & Parameter Builders
+# ============================================
+# Used by both FundPortfolioManager and AsyncFundPortfolioManager
+
+# Uniqueness constraints back every MERGE/MATCH on an id (index lookups
+# instead of label scans); all statements are idempotent
+_SCHEMA_STATEMENTS = [
+    "CREATE CONSTRAINT fund_id_unique IF NOT EXISTS FOR (f:Fund) REQUIRE f.fund_id IS UNIQUE",
+    "CREATE CONSTRAINT instrument_id_unique IF NOT EXISTS FOR (i:Instrument) REQUIRE i.instrument_id IS UNIQUE",
+    "CREATE CONSTRAINT snapshot_id_unique IF NOT EXISTS FOR (s:MonthlySnapshot) REQUIRE s.snapshot_id IS UNIQUE",
+    "CREATE INDEX fund_name_index IF NOT EXISTS FOR (f:Fund) ON (f.fund_name)",
+    "CREATE INDEX instrument_name_index IF NOT EXISTS FOR (i:Instrument) ON (i.name)",
+    "CREATE INDEX snapshot_date_index IF NOT EXISTS FOR (s:MonthlySnapshot) ON (s.year, s.month)",
+]
+
+# (uri, database) pairs whose schema was already ensured in this process
+_schema_ready = set()
+
+
+def _schema_item_exists(error: Exception) -> bool:
+    """True if a schema statement failed only because the item already exists"""
+    return isinstance(error, ClientError) and "AlreadyExists" in (error.code or "")
+
+_CREATE_INSTRUMENTS_QUERY = """
+UNWIND $instruments AS row
+MERGE (i:Instrument {instrument_id: row.instrument_id})
+ON CREATE SET
+    i.name        = row.name,
+    i.asset_class = row.asset_class,
+    i.sub_type    = row.sub_type
+RETURN count(i) AS instruments_created
+"""
+
+_CREATE_FUND_QUERY = """
+MERGE (f:Fund {fund_id: $fund_id})
+ON CREATE SET
+    f.fund_name = $fund_name,
+    f.amc = $amc,
+    f.category = $category
+RETURN f.fund_id AS fund_id, f.fund_name AS fund_name
+"""
+
+# Streams holdings through APOC in fixed-size inner transactions.
+# Sequential, since every HOLDS write locks its snapshot node.
+_ADD_HOLDINGS_QUERY = """
+CALL apoc.periodic.iterate(
+    'UNWIND $holdings AS holding RETURN holding',
+    'MATCH (snap:MonthlySnapshot {snapshot_id: holding.snapshot_id})
+     MATCH (i:Instrument {instrument_id: holding.instrument_id})
+     CREATE (snap)-[:HOLDS {weight: holding.weight}]->(i)',
+    {batchSize: $batch_size, parallel: false, params: {holdings: $holdings}}
+)
+YIELD failedOperations, errorMessages, updateStatistics
+RETURN updateStatistics.relationshipsCreated AS holdings_created,
+       failedOperations AS failed_operations,
+       errorMessages AS error_messages
+"""
+
+_LOAD_PORTFOLIO_QUERY = """
+CALL {
+    UNWIND $holdings AS row
+    MERGE (i:Instrument {instrument_id: row.instrument_id})
+    ON CREATE SET
+        i.name        = row.name,
+        i.asset_class = row.asset_class,
+        i.sub_type    = row.sub_type
+    RETURN count(i) AS instruments_created
+}
+MERGE (f:Fund {fund_id: $fund_id})
+ON CREATE SET
+    f.fund_name = $fund_name,
+    f.amc = $amc,
+    f.category = $category
+CREATE (snap:MonthlySnapshot {
+    snapshot_id: $snapshot_id,
+    fund_id: $fund_id,
+    year: $year,
+    month: $month,
+    total_aum: $total_aum,
+    num_holdings: $num_holdings
+})
+CREATE (f)-[:LATEST_SNAPSHOT]->(snap)
+WITH f, snap, instruments_created
+CALL {
+    WITH f, snap
+    UNWIND $holdings AS holding
+    MATCH (i:Instrument {instrument_id: holding.instrument_id})
+    CREATE (snap)-[:HOLDS {weight: holding.weight}]->(i)
+    CREATE (f)-[:CURRENT_HOLDINGS {weight: holding.weight}]->(i)
+    RETURN count(*) AS holdings_created
+}
+RETURN {
+    instruments_created: instruments_created,
+    fund_id: f.fund_id,
+    snapshot_id: snap.snapshot_id,
+    holdings_created: holdings_created,
+    current_holdings_created: holdings_created
+} AS summary
+"""
+
+
+# Batched form of _LOAD_PORTFOLIO_QUERY: each $funds row carries its own
+# snapshot and holdings, so one statement loads a whole batch of funds.
+_LOAD_PORTFOLIOS_BULK_QUERY = """
+UNWIND $funds AS row
+MERGE (f:Fund {fund_id: row.fund_id})
+ON CREATE SET
+    f.fund_name = row.fund_name,
+    f.amc = row.amc
+CREATE (snap:MonthlySnapshot {
+    snapshot_id: row.snapshot_id,
+    fund_id: row.fund_id,
+    year: row.year,
+    month: row.month,
+    total_aum: row.total_aum,
+    num_holdings: row.num_holdings
+})
+CREATE (f)-[:LATEST_SNAPSHOT]->(snap)
+WITH f, snap, row
+UNWIND row.holdings AS holding
+MERGE (i:Instrument {instrument_id: holding.instrument_id})
+ON CREATE SET
+    i.name        = holding.name,
+    i.asset_class = holding.asset_class,
+    i.sub_type    = holding.sub_type
+CREATE (snap)-[:HOLDS {weight: holding.weight}]->(i)
+CREATE (f)-[:CURRENT_HOLDINGS {weight: holding.weight}]->(i)
+RETURN count(*) AS holdings_created
+"""
+
+
+def _compact(row: Dict) -> Dict:
+    """Drop None values so UNWIND payloads are flat maps of primitives"""
+    return {key: value for key, value in row.items() if value is not None}
+
+
+def _normalize_holdings(holdings: List[Dict]) -> List[Dict]:
+    """
+    Resolve source-schema keys once into canonical rows
+    
+    Each row carries instrument_id, name, asset_class, sub_type and weight
+    (missing fields omitted); items without an ID are skipped. Canonical
+    rows map onto themselves, so normalizing twice is harmless.
+    """
+    rows = []
+    for item in holdings:
+        instrument_id = item.get("instrument_id") or item.get("stock_id")
+        if instrument_id:  # Only add if we have an ID
+            rows.append(_compact({
+                "instrument_id": instrument_id,
+                "name": item.get("name") or item.get("Stock_Name"),
+                "asset_class": item.get("asset_class"),
+                "sub_type": item.get("sub_type"),
+                "weight": item.get("weights") or item.get("weight"),
+            }))
+    return rows
+
+
+def _holding_rows(holdings_data: List[Dict]) -> List[Dict]:
+    """HOLDS query rows; items without an ID or snapshot_id are skipped"""
+    rows = []
+    for holding in holdings_data:
+        instrument_id = holding.get("instrument_id") or holding.get("stock_id")
+        if instrument_id and holding.get("snapshot_id"):
+            rows.append(_compact({
+                "snapshot_id": holding["snapshot_id"],
+                "instrument_id": instrument_id,
+                "weight": holding.get("weights") or holding.get("weight"),
+            }))
+    return rows
+
+
+def _log_holdings_result(result) -> int:
+    """Log an _ADD_HOLDINGS_QUERY result and return the holdings created"""
+    if result["failed_operations"]:
+        logger.warning(
+            f"{result['failed_operations']} holdings failed to load: "
+            f"{result['error_messages']}"
+        )
+    
+    holdings_created = result["holdings_created"]
+    logger.info(f"Created {holdings_created} holdings")
+    return holdings_created
+
+
+def _connection_settings(uri, user, password, database, max_connection_pool_size,
+                         connection_acquisition_timeout, max_transaction_retry_time,
+                         fetch_size) -> Tuple[str, Tuple[str, str], str, Dict]:
+    """
+    Fill unset connection arguments from Neo4jConfig
+    
+    Returns:
+        Tuple of (uri, auth, database, driver keyword arguments)
+    """
+    # Load from config if not provided
+    if None in (uri, user, password, database, max_connection_pool_size,
+                connection_acquisition_timeout, max_transaction_retry_time,
+                fetch_size):
+        config = get_neo4j_config()
+        uri = uri or config.url
+        user = user or config.username
+        password = password or config.password
+        database = database or config.database
+        if max_connection_pool_size is None:
+            max_connection_pool_size = config.pool_size
+        if connection_acquisition_timeout is None:
+            connection_acquisition_timeout = config.connection_acquisition_timeout
+        if max_transaction_retry_time is None:
+            max_transaction_retry_time = config.max_transaction_retry_time
+        if fetch_size is None:
+            fetch_size = config.fetch_size
+    
+    driver_kwargs = {
+        "max_connection_pool_size": max_connection_pool_size,
+        "connection_acquisition_timeout": connection_acquisition_timeout,
+        "max_transaction_retry_time": max_transaction_retry_time,
+        "fetch_size": fetch_size,
+        "keep_alive": True,
+    }
+    return uri, (user, password), database, driver_kwargs
+
+
+# Drivers handed out by _get_driver (functools.cache can't enumerate them)
+_open_drivers = []
+
+
+@functools.cache
+def _get_driver(uri: str, auth: Tuple[str, str], **driver_kwargs):
+    """
+    Shared sync driver for one set of connection settings
+    
+    Drivers are thread-safe and own the Bolt connection pool, so every
+    FundPortfolioManager with the same settings reuses one pool instead of
+    reconnecting and warming up a new one.
+    """
+    driver = GraphDatabase.driver(uri, auth=auth, **driver_kwargs)
+    _open_drivers.append(driver)
+    logger.info("Connected to Neo4j")
+    return driver
+
+
+@atexit.register
+def shutdown_driver():
+    """Close every shared driver; registered to run at process exit"""
+    _get_driver.cache_clear()
+    while _open_drivers:
+        _open_drivers.pop().close()
+        logger.info("Closed Neo4j connection")
+
+
 class FundPortfolioManager:
     """Manages fund portfolio data in Neo4j"""
     
     def __init__(self, uri: Optional[str] = None, user: Optional[str] = None, 
-                 password: Optional[str] = None):
+                 password: Optional[str] = None, database: Optional[str] = None,
+                 max_connection_pool_size: Optional[int] = None,
+                 connection_acquisition_timeout: Optional[float] = None,
+                 max_transaction_retry_time: Optional[float] = None,
+                 fetch_size: Optional[int] = None):
         """
         Initialize Neo4j connection
         
@@ -26,21 +305,82 @@ class FundPortfolioManager:
             uri: Neo4j connection URI (optional, loads from config if None)
             user: Neo4j username (optional)
             password: Neo4j password (optional)
+            database: Target database (optional)
+            max_connection_pool_size: Max pooled Bolt connections (optional)
+            connection_acquisition_timeout: Seconds to wait for a pooled
+                connection (optional)
+            max_transaction_retry_time: Seconds to retry transient
+                transaction failures (optional)
+            fetch_size: Records fetched per batch (optional)
+        """
+        uri, auth, database, driver_kwargs = _connection_settings(
+            uri, user, password, database, max_connection_pool_size,
+            connection_acquisition_timeout, max_transaction_retry_time, fetch_size
+        )
+        
+        self.driver = _get_driver(uri, auth, **driver_kwargs)
+        self._uri = uri
+        self._database = database
+        self._pool_size = driver_kwargs["max_connection_pool_size"]
+    
+    def _session(self):
+        """
+        Open a write session on the configured database
+        
+        Naming the database up front skips the driver's per-session
+        home-database lookup.
+        """
+        return self.driver.session(
+            database=self._database,
+            default_access_mode=WRITE_ACCESS
+        )
+    
+    def ensure_schema(self):
         """
-        # Load from config if not provided
-        if uri is None or user is None or password is None:
-            config = get_neo4j_config()
-            uri = uri or config.url
-            user = user or config.username
-            password = password or config.password
+        Create the constraints and indexes the loaders rely on
+        
+        Needs schema privileges, so it is called explicitly (by setup and
+        the loaders) rather than on connect. Idempotent, and runs at most
+        once per database per process; the database is only marked ready
+        once every statement succeeded (or found its item already present).
         
-        self.driver = GraphDatabase.driver(uri, auth=(user, password))
-        logger.info("Connected to Neo4j")
+        Raises:
+            neo4j.exceptions.Neo4jError: If a statement fails for any other
+                reason (e.g. authentication or permissions)
+        """
+        key = (self._uri, self._database)
+        if key in _schema_ready:
+            return
+        
+        def create_schema(tx):
+            for statement in _SCHEMA_STATEMENTS:
+                tx.run(statement).consume()
+        
+        with self._session() as session:
+            try:
+                session.execute_write(create_schema)
+            except Exception as e:
+                # e.g. an equivalent constraint exists under another name;
+                # fall back to applying statements one at a time
+                logger.warning(f"Batched schema setup failed, retrying individually: {e}")
+                for statement in _SCHEMA_STATEMENTS:
+                    try:
+                        session.run(statement).consume()
+                    except Exception as e:
+                        if not _schema_item_exists(e):
+                            raise
+                        logger.warning(f"Schema item already exists: {e}")
+        
+        _schema_ready.add(key)
+        logger.info("Ensured Neo4j constraints and indexes")
     
     def close(self):
-        """Close Neo4j connection"""
-        self.driver.close()
-        logger.info("Closed Neo4j connection")
+        """
+        Release this manager
+        
+        The driver is shared with other managers, so it stays open; use
+        shutdown_driver() to close it.
+        """
     
     def __enter__(self):
         """Context manager entry"""
@@ -68,35 +408,12 @@ class FundPortfolioManager:
         Returns:
             Number of instruments created or merged
         """
-        query = """
-        UNWIND $instruments AS row
-        MERGE (i:Instrument {instrument_id: row.instrument_id})
-        ON CREATE SET
-            i.name        = row.name,
-            i.asset_class = row.asset_class,
-            i.sub_type    = row.sub_type
-        RETURN count(i) AS instruments_created
-        """
-        
-        # Transform data to match query parameters
-        transformed_data = []
-        for item in instruments_data:
-            name = item.get("name") or item.get("Stock_Name")
-            instrument_id = item.get("instrument_id") or item.get("stock_id")
-            asset_class = item.get("asset_class")
-            sub_type = item.get("sub_type")
-            
-            if instrument_id:  # Only add if we have an ID
-                transformed_data.append({
-                    "instrument_id": instrument_id,
-                    "name": name,
-                    "asset_class": asset_class,
-                    "sub_type": sub_type,
-                })
-        
-        with self.driver.session() as session:
+        with self._session() as session:
             result = session.execute_write(
-                lambda tx: tx.run(query, instruments=transformed_data).single()
+                lambda tx: tx.run(
+                    _CREATE_INSTRUMENTS_QUERY,
+                    instruments=_normalize_holdings(instruments_data)
+                ).single()
             )
             instruments_created = result["instruments_created"]
             logger.info(f"Created/merged {instruments_created} instruments")
@@ -106,8 +423,24 @@ class FundPortfolioManager:
     # STEP 2: CREATE FUND NODE
     # =========================================================================
     
+    def _merge_fund(self, fund_id: int, fund_name: str, amc: str,
+                    category: Optional[str]):
+        """Run _CREATE_FUND_QUERY and return its record"""
+        with self._session() as session:
+            result = session.execute_write(
+                lambda tx: tx.run(
+                    _CREATE_FUND_QUERY,
+                    fund_id=fund_id,
+                    fund_name=fund_name,
+                    amc=amc,
+                    category=category
+                ).single()
+            )
+        logger.info(f"Created fund {result['fund_name']}")
+        return result
+    
     def create_fund(self, fund_id: int, fund_name: str, amc: str, 
-                    category: Optional[str] = None) -> Dict:
+                    category: Optional[str] = None) -> int:
         """
         Create a fund node
         
@@ -118,36 +451,32 @@ class FundPortfolioManager:
             category: Fund category (optional)
         
         Returns:
-            Created fund details
+            ID of the created fund
         """
-        query = """
-        MERGE (f:Fund {fund_id: $fund_id})
-        ON CREATE SET
-            f.fund_name = $fund_name,
-            f.amc = $amc,
-            f.category = $category
-        RETURN f.fund_id AS fund_id, f.fund_name AS fund_name
+        return self._merge_fund(fund_id, fund_name, amc, category)["fund_id"]
+    
+    def create_fund_full(self, fund_id: int, fund_name: str, amc: str,
+                         category: Optional[str] = None) -> Dict:
         """
+        Create a fund node, returning all of its details
         
-        with self.driver.session() as session:
-            result = session.execute_write(
-                lambda tx: tx.run(
-                    query,
-                    fund_id=fund_id,
-                    fund_name=fund_name,
-                    amc=amc,
-                    category=category
-                ).single()
-            )
-            logger.info(f"Created fund {result['fund_name']}")
-            return dict(result)
+        Args:
+            fund_id: Unique fund identifier
+            fund_name: Name of the fund
+            amc: Asset Management Company
+            category: Fund category (optional)
+        
+        Returns:
+            Created fund details
+        """
+        return dict(self._merge_fund(fund_id, fund_name, amc, category))
     
     # =========================================================================
     # STEP 3: CREATE MONTHLY SNAPSHOT
     # =========================================================================
     
     def create_snapshot(self, snapshot_id: str, fund_id: int, year: int, 
-                       month: int, total_aum: float, num_holdings: int) -> Dict:
+                       month: int, total_aum: float, num_holdings: int) -> str:
         """
         Create a monthly snapshot for a fund
         
@@ -160,7 +489,7 @@ class FundPortfolioManager:
             num_holdings: Number of holdings in this snapshot
         
         Returns:
-            Created snapshot details
+            ID of the created snapshot
         """
         query = """
         CREATE (snap:MonthlySnapshot {
@@ -174,7 +503,7 @@ class FundPortfolioManager:
         RETURN snap.snapshot_id AS snapshot_id
         """
         
-        with self.driver.session() as session:
+        with self._session() as session:
             result = session.execute_write(
                 lambda tx: tx.run(
                     query,
@@ -187,7 +516,7 @@ class FundPortfolioManager:
                 ).single()
             )
             logger.info(f"Created snapshot {result['snapshot_id']}")
-            return dict(result)
+            return result["snapshot_id"]
     
     # =========================================================================
     # STEP 4: LINK SNAPSHOT TO FUND
@@ -202,31 +531,36 @@ class FundPortfolioManager:
             snapshot_id: Snapshot identifier
         
         Returns:
-            True if successful
+            True if the relationship was created
         """
         query = """
         MATCH (f:Fund {fund_id: $fund_id})
         MATCH (snap:MonthlySnapshot {snapshot_id: $snapshot_id})
         CREATE (f)-[:LATEST_SNAPSHOT]->(snap)
-        RETURN f.fund_id AS fund_id, snap.snapshot_id AS snapshot_id
         """
         
-        with self.driver.session() as session:
-            result = session.execute_write(
+        # Only the write count is needed: read it from the result summary
+        with self._session() as session:
+            summary = session.execute_write(
                 lambda tx: tx.run(
                     query,
                     fund_id=fund_id,
                     snapshot_id=snapshot_id,
-                ).single()
+                ).consume()
             )
-            logger.info(f"Linked fund {result['fund_id']} to snapshot {result['snapshot_id']}")
-            return True
+        
+        if not summary.counters.relationships_created:
+            logger.warning(f"Fund {fund_id} or snapshot {snapshot_id} not found; nothing linked")
+            return False
+        
+        logger.info(f"Linked fund {fund_id} to snapshot {snapshot_id}")
+        return True
     
     # =========================================================================
     # STEP 5: ADD HOLDINGS
     # =========================================================================
     
-    def add_holdings(self, holdings_data: List[Dict]) -> int:
+    def add_holdings(self, holdings_data: List[Dict], batch_size: int = 1000) -> int:
         """
         Add holdings to a snapshot
         
@@ -235,39 +569,20 @@ class FundPortfolioManager:
                 - snapshot_id
                 - instrument_id or stock_id
                 - weights or weight
+            batch_size: Holdings per inner transaction
         
         Returns:
             Number of holdings created
         """
-        query = """
-        UNWIND $holdings AS holding
-        MATCH (snap:MonthlySnapshot {snapshot_id: holding.snapshot_id})
-        MATCH (i:Instrument {instrument_id: holding.instrument_id})
-        CREATE (snap)-[:HOLDS {
-            weight: holding.weight
-        }]->(i)
-        RETURN count(*) AS holdings_created
-        """
-        
-        transformed_data = []
-        for holding in holdings_data:
-            instrument_id = holding.get("instrument_id") or holding.get("stock_id")
-            weight = holding.get("weights") or holding.get("weight")
-            
-            if instrument_id and holding.get("snapshot_id"):
-                transformed_data.append({
-                    "snapshot_id": holding["snapshot_id"],
-                    "instrument_id": instrument_id,
-                    "weight": weight,
-                })
-        
-        with self.driver.session() as session:
-            result = session.execute_write(
-                lambda tx: tx.run(query, holdings=transformed_data).single()
-            )
-            holdings_created = result["holdings_created"]
-            logger.info(f"Created {holdings_created} holdings")
-            return holdings_created
+        # apoc.periodic.iterate manages its own transactions, so auto-commit
+        with self._session() as session:
+            result = session.run(
+                _ADD_HOLDINGS_QUERY,
+                holdings=_holding_rows(holdings_data),
+                batch_size=batch_size
+            ).single()
+        
+        return _log_holdings_result(result)
     
     # =========================================================================
     # STEP 6: CREATE CURRENT HOLDINGS
@@ -291,20 +606,20 @@ class FundPortfolioManager:
         CREATE (f)-[:CURRENT_HOLDINGS {
             weight: h.weight
         }]->(i)
-        RETURN count(*) AS current_holdings_created
         """
         
-        with self.driver.session() as session:
-            result = session.execute_write(
+        with self._session() as session:
+            summary = session.execute_write(
                 lambda tx: tx.run(
                     query,
                     fund_id=fund_id,
                     snapshot_id=snapshot_id,
-                ).single()
+                ).consume()
             )
-            current_created = result["current_holdings_created"]
-            logger.info(f"Created {current_created} current holdings")
-            return current_created
+        
+        current_created = summary.counters.relationships_created
+        logger.info(f"Created {current_created} current holdings")
+        return current_created
     
     # =========================================================================
     # HELPER: LOAD COMPLETE PORTFOLIO
@@ -328,39 +643,334 @@ class FundPortfolioManager:
         
         Returns:
             Summary of operations performed
+        
+        All six steps run as one Cypher statement in a single write
+        transaction, so a portfolio is either fully loaded or not at all.
         """
-        # Step 1: Create instruments
-        instruments_created = self.create_instruments(holdings_data)
+        holdings = _normalize_holdings(holdings_data)
         
-        # Step 2: Create fund
-        fund = self.create_fund(fund_id, fund_name, amc)
+        with self._session() as session:
+            summary = session.execute_write(
+                lambda tx: tx.run(
+                    _LOAD_PORTFOLIO_QUERY,
+                    holdings=holdings,
+                    fund_id=fund_id,
+                    fund_name=fund_name,
+                    amc=amc,
+                    category=None,
+                    snapshot_id=snapshot_id,
+                    year=year,
+                    month=month,
+                    total_aum=total_aum,
+                    num_holdings=len(holdings_data),
+                ).single()["summary"]
+            )
         
-        # Step 3: Create snapshot
-        snapshot = self.create_snapshot(
-            snapshot_id, fund_id, year, month, total_aum, len(holdings_data)
+        logger.info(
+            f"Loaded fund {summary['fund_id']} snapshot {summary['snapshot_id']}: "
+            f"{summary['instruments_created']} instruments, "
+            f"{summary['holdings_created']} holdings"
         )
+        return dict(summary)
+    
+    def load_portfolios_parallel(self, portfolios: List[Dict],
+                                 max_workers: int = 8) -> List[Dict]:
+        """
+        Load many portfolios from a thread pool, one transaction each
         
-        # Step 4: Link snapshot to fund
-        self.link_snapshot_to_fund(fund_id, snapshot_id)
+        Every load_portfolio call opens its own session, so workers share
+        only the thread-safe driver pool. Workers are capped at the pool
+        size so none of them waits on a connection.
         
-        # Step 5: Add holdings (add snapshot_id to each)
-        holdings_with_snapshot = [
-            {**h, "snapshot_id": snapshot_id} for h in holdings_data
-        ]
-        holdings_created = self.add_holdings(holdings_with_snapshot)
+        Args:
+            portfolios: List of load_portfolio keyword-argument dicts
+            max_workers: Maximum portfolio loads in flight
+        
+        Returns:
+            One entry per portfolio, in input order: the load_portfolio
+            summary, or {"fund_id", "fund_name", "error"} if that fund failed
+        """
+        results = [None] * len(portfolios)
+        max_workers = min(max_workers, self._pool_size)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.load_portfolio, **portfolio): index
+                for index, portfolio in enumerate(portfolios)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    portfolio = portfolios[index]
+                    logger.error(f"Failed to load fund {portfolio['fund_name']}: {e}")
+                    results[index] = {
+                        "fund_id": portfolio["fund_id"],
+                        "fund_name": portfolio["fund_name"],
+                        "error": str(e)
+                    }
+        
+        return results
+    
+    # =========================================================================
+    # HELPER: BULK LOAD MANY PORTFOLIOS
+    # =========================================================================
+    
+    def load_portfolios_bulk(self, portfolios: List[Dict], batch_size: int = 20) -> Dict:
+        """
+        Load many portfolios with one parameterized UNWIND query per batch
+        
+        Equivalent to calling load_portfolio for each entry, but a whole batch
+        of funds shares one transaction and one planned query.
+        
+        Args:
+            portfolios: List of dicts with keys fund_id, fund_name, amc,
+                snapshot_id, year, month, total_aum and holdings_data
+            batch_size: Number of funds per transaction
         
-        # Step 6: Create current holdings
-        current_created = self.create_current_holdings(fund_id, snapshot_id)
+        Returns:
+            Summary with funds_loaded, holdings_created and failed_funds
+            (names of funds that could not be loaded)
+        
+        A failed batch is rolled back and retried fund by fund through
+        load_portfolio, so one bad fund (e.g. a snapshot that was already
+        loaded) only costs itself.
+        """
+        funds = []
+        for portfolio in portfolios:
+            holdings_data = portfolio["holdings_data"]
+            holdings = _normalize_holdings(holdings_data)
+            
+            funds.append({
+                "fund_id": portfolio["fund_id"],
+                "fund_name": portfolio["fund_name"],
+                "amc": portfolio["amc"],
+                "snapshot_id": portfolio["snapshot_id"],
+                "year": portfolio["year"],
+                "month": portfolio["month"],
+                "total_aum": portfolio["total_aum"],
+                "num_holdings": len(holdings_data),
+                "holdings": holdings,
+            })
+        
+        holdings_created = 0
+        failed_funds = []
+        with self._session() as session:
+            for start in range(0, len(funds), batch_size):
+                batch = funds[start:start + batch_size]
+                try:
+                    result = session.execute_write(
+                        lambda tx: tx.run(_LOAD_PORTFOLIOS_BULK_QUERY, funds=batch).single()
+                    )
+                except Exception as e:
+                    logger.warning(
+                        f"Batch of funds {start + 1}-{start + len(batch)} failed, "
+                        f"retrying one fund at a time: {e}"
+                    )
+                    for portfolio in portfolios[start:start + batch_size]:
+                        try:
+                            summary = self.load_portfolio(**portfolio)
+                            holdings_created += summary["holdings_created"]
+                        except Exception as e:
+                            logger.error(f"Failed to load fund {portfolio['fund_name']}: {e}")
+                            failed_funds.append(portfolio["fund_name"])
+                    continue
+                
+                holdings_created += result["holdings_created"]
+                logger.info(
+                    f"Loaded funds {start + 1}-{start + len(batch)} of {len(funds)}"
+                )
         
         return {
-            "instruments_created": instruments_created,
-            "fund_id": fund["fund_id"],
-            "snapshot_id": snapshot["snapshot_id"],
+            "funds_loaded": len(funds) - len(failed_funds),
             "holdings_created": holdings_created,
-            "current_holdings_created": current_created
+            "failed_funds": failed_funds
         }
 
 
+class AsyncFundPortfolioManager:
+    """
+    Async counterpart of FundPortfolioManager
+    
+    Uses the asyncio Neo4j driver so one event loop can overlap many
+    portfolio loads without blocking on each Bolt round-trip.
+    """
+    
+    def __init__(self, uri: Optional[str] = None, user: Optional[str] = None, 
+                 password: Optional[str] = None, database: Optional[str] = None,
+                 max_connection_pool_size: Optional[int] = None,
+                 connection_acquisition_timeout: Optional[float] = None,
+                 max_transaction_retry_time: Optional[float] = None,
+                 fetch_size: Optional[int] = None):
+        """
+        Initialize async Neo4j connection
+        
+        Args:
+            Same as FundPortfolioManager
+        """
+        uri, auth, database, driver_kwargs = _connection_settings(
+            uri, user, password, database, max_connection_pool_size,
+            connection_acquisition_timeout, max_transaction_retry_time, fetch_size
+        )
+        
+        self.driver = AsyncGraphDatabase.driver(uri, auth=auth, **driver_kwargs)
+        self._uri = uri
+        self._database = database
+        logger.info("Connected to Neo4j (async)")
+    
+    def _session(self):
+        """Open an async write session on the configured database"""
+        return self.driver.session(
+            database=self._database,
+            default_access_mode=WRITE_ACCESS
+        )
+    
+    async def _write_single(self, query: str, **params):
+        """Run a write query in its own transaction and return its single record"""
+        async def tx_fn(tx):
+            result = await tx.run(query, **params)
+            return await result.single()
+        
+        async with self._session() as session:
+            return await session.execute_write(tx_fn)
+    
+    async def ensure_schema(self):
+        """Async version of FundPortfolioManager.ensure_schema"""
+        key = (self._uri, self._database)
+        if key in _schema_ready:
+            return
+        
+        async def create_schema(tx):
+            for statement in _SCHEMA_STATEMENTS:
+                result = await tx.run(statement)
+                await result.consume()
+        
+        async with self._session() as session:
+            try:
+                await session.execute_write(create_schema)
+            except Exception as e:
+                logger.warning(f"Batched schema setup failed, retrying individually: {e}")
+                for statement in _SCHEMA_STATEMENTS:
+                    try:
+                        result = await session.run(statement)
+                        await result.consume()
+                    except Exception as e:
+                        if not _schema_item_exists(e):
+                            raise
+                        logger.warning(f"Schema item already exists: {e}")
+        
+        _schema_ready.add(key)
+        logger.info("Ensured Neo4j constraints and indexes")
+    
+    async def aclose(self):
+        """Close Neo4j connection"""
+        await self.driver.close()
+        logger.info("Closed Neo4j connection (async)")
+    
+    async def __aenter__(self):
+        """Async context manager entry"""
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit"""
+        await self.aclose()
+    
+    async def create_instruments(self, instruments_data: List[Dict]) -> int:
+        """Async version of FundPortfolioManager.create_instruments"""
+        result = await self._write_single(
+            _CREATE_INSTRUMENTS_QUERY,
+            instruments=_normalize_holdings(instruments_data)
+        )
+        instruments_created = result["instruments_created"]
+        logger.info(f"Created/merged {instruments_created} instruments")
+        return instruments_created
+    
+    async def _merge_fund(self, fund_id: int, fund_name: str, amc: str,
+                          category: Optional[str]):
+        """Run _CREATE_FUND_QUERY and return its record"""
+        result = await self._write_single(
+            _CREATE_FUND_QUERY,
+            fund_id=fund_id,
+            fund_name=fund_name,
+            amc=amc,
+            category=category
+        )
+        logger.info(f"Created fund {result['fund_name']}")
+        return result
+    
+    async def create_fund(self, fund_id: int, fund_name: str, amc: str, 
+                          category: Optional[str] = None) -> int:
+        """Async version of FundPortfolioManager.create_fund"""
+        result = await self._merge_fund(fund_id, fund_name, amc, category)
+        return result["fund_id"]
+    
+    async def create_fund_full(self, fund_id: int, fund_name: str, amc: str,
+                               category: Optional[str] = None) -> Dict:
+        """Async version of FundPortfolioManager.create_fund_full"""
+        return dict(await self._merge_fund(fund_id, fund_name, amc, category))
+    
+    async def add_holdings(self, holdings_data: List[Dict], batch_size: int = 1000) -> int:
+        """Async version of FundPortfolioManager.add_holdings"""
+        async with self._session() as session:
+            result = await session.run(
+                _ADD_HOLDINGS_QUERY,
+                holdings=_holding_rows(holdings_data),
+                batch_size=batch_size
+            )
+            record = await result.single()
+        
+        return _log_holdings_result(record)
+    
+    async def load_portfolio(self, fund_id: int, fund_name: str, amc: str,
+                             snapshot_id: str, year: int, month: int,
+                             total_aum: float, holdings_data: List[Dict]) -> Dict:
+        """Async version of FundPortfolioManager.load_portfolio"""
+        holdings = _normalize_holdings(holdings_data)
+        
+        record = await self._write_single(
+            _LOAD_PORTFOLIO_QUERY,
+            holdings=holdings,
+            fund_id=fund_id,
+            fund_name=fund_name,
+            amc=amc,
+            category=None,
+            snapshot_id=snapshot_id,
+            year=year,
+            month=month,
+            total_aum=total_aum,
+            num_holdings=len(holdings_data),
+        )
+        summary = record["summary"]
+        
+        logger.info(
+            f"Loaded fund {summary['fund_id']} snapshot {summary['snapshot_id']}: "
+            f"{summary['instruments_created']} instruments, "
+            f"{summary['holdings_created']} holdings"
+        )
+        return dict(summary)
+    
+    async def load_portfolios(self, portfolios: List[Dict],
+                              max_concurrency: int = 16) -> List[Dict]:
+        """
+        Load many portfolios concurrently, one transaction each
+        
+        Args:
+            portfolios: List of load_portfolio keyword-argument dicts
+            max_concurrency: Maximum portfolio loads in flight
+        
+        Returns:
+            One summary per portfolio, in input order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def load_one(portfolio: Dict) -> Dict:
+            async with semaphore:
+                return await self.load_portfolio(**portfolio)
+        
+        return await asyncio.gather(*(load_one(p) for p in portfolios))
+
+
 # ============================================
 # Main
 # ============================================
@@ -3,24 +3,42 @@ SQL Tools Module
 Custom tools for SQL database operations including fund screening and benchmarks
 """
 
-from typing import Literal
+import time
+import functools
+from typing import Dict, List, Literal, Optional, Tuple
 from pydantic import BaseModel, Field, model_validator
 from langchain.tools import tool
-from langchain_community.agent_toolkits import SQLDatabaseToolkit
-import yfinance as yf
+
+# yfinance and SQLDatabaseToolkit are imported where they are used: both
+# pull in heavy dependency trees that the screener alone never needs
 
 
 # ============================================
 # Tool Input Models
 # ============================================
 
+Period = Literal["1d", "5d", "1mo", "3mo", "6mo", "1y", "2y", "5y", "10y"]
+
+
 class BenchmarkInput(BaseModel):
     """Input parameters for fetching benchmark data"""
     benchmark: str = Field(
         ...,
         description="The ticker symbol of the benchmark (e.g., ^NSEI, ^CRSLDX)"
     )
-    period: Literal["1d", "5d", "1mo", "3mo", "6mo", "1y", "2y", "5y", "10y"] = Field(
+    period: Period = Field(
+        "1y",
+        description="The time frame for fetching data."
+    )
+
+
+class BenchmarkBatchInput(BaseModel):
+    """Input parameters for fetching several benchmarks at once"""
+    benchmarks: List[str] = Field(
+        ...,
+        description="Ticker symbols of the benchmarks (e.g., ['^NSEI', '^CRSLDX'])"
+    )
+    period: Period = Field(
         "1y",
         description="The time frame for fetching data."
     )
@@ -49,11 +67,51 @@ class ScreenerInput(BaseModel):
     def check_weights_sum(self):
         """Validate that weights sum to approximately 1.0"""
         total = self.weight_returns_3m + self.weight_alpha_1y + self.weight_beta_1y
-        if not (0.99 <= total <= 1.01):  # Allow tiny float tolerance
+        if abs(total - 1.0) > 0.01:  # Allow tiny float tolerance
             raise ValueError(f"Sum of weights must be 100%. Got {total:.2f}")
         return self
 
 
+# ============================================
+# Benchmark Price Cache
+# ============================================
+
+# Cached closes are reused for up to an hour
+PRICE_CACHE_TTL = 3600
+
+
+def _ttl_bucket() -> int:
+    """Current cache time bucket; changes every PRICE_CACHE_TTL seconds"""
+    return int(time.time() // PRICE_CACHE_TTL)
+
+
+@functools.lru_cache(maxsize=256)
+def _fetch_close(benchmark: str, period: str, bucket: int) -> Optional[Tuple[float, float]]:
+    """
+    First and last close of a ticker over a period
+    
+    Args:
+        benchmark: Ticker symbol
+        period: yfinance period
+        bucket: Cache time bucket (see _ttl_bucket), part of the cache key
+    
+    Returns:
+        Tuple of (initial, final) close, or None if no data
+    """
+    import yfinance as yf
+    
+    closes = yf.Ticker(benchmark).history(period=period)['Close'].to_numpy()
+    if closes.size == 0:
+        return None
+    return float(closes[0]), float(closes[-1])
+
+
+def _format_return(initial_price: float, final_price: float) -> str:
+    """Point-to-point return as a percentage string"""
+    point_to_point_return = ((final_price - initial_price) / initial_price) * 100
+    return f"{point_to_point_return:.2f}%"
+
+
 # ============================================
 # Custom Tools
 # ============================================
@@ -77,33 +135,84 @@ def get_benchmark_data(benchmark: str, period: str) -> str:
         Point-to-point return percentage as a string
     """
     try:
-        benchmark_index = yf.Ticker(benchmark)
-        benchmark_data = benchmark_index.history(period=period)['Close']
+        closes = _fetch_close(benchmark, period, _ttl_bucket())
         
-        if benchmark_data.empty:
+        if closes is None:
             return f"Could not fetch data for ticker: {benchmark}"
         
-        initial_price = benchmark_data.iloc[0]
-        final_price = benchmark_data.iloc[-1]
-        point_to_point_return = ((final_price - initial_price) / initial_price) * 100
-        
-        return f"{point_to_point_return:.2f}%"
+        return _format_return(*closes)
+    
+    except Exception as e:
+        return f"Error fetching benchmark data: {str(e)}"
+
+
+@tool(args_schema=BenchmarkBatchInput)
+def get_benchmark_data_batch(benchmarks: List[str], period: str) -> str:
+    """
+    Fetches point-to-point returns for several stock market benchmarks at once.
     
+    Use this instead of repeated get_benchmark_data calls when comparing
+    benchmarks; all tickers are downloaded in parallel.
+    
+    The `benchmarks` argument is a list of ticker symbols (see get_benchmark_data).
+    
+    The `period` argument is the time frame, one of: "1d", "5d", "1mo", "3mo", "6mo", "1y", "2y", "5y", "10y".
+    
+    Returns:
+        One "TICKER: return%" line per benchmark
+    """
+    import yfinance as yf
+    
+    try:
+        data = yf.download(
+            benchmarks,
+            period=period,
+            group_by='ticker',
+            threads=True,
+            progress=False
+        )
     except Exception as e:
         return f"Error fetching benchmark data: {str(e)}"
+    
+    # Columns are (ticker, field) pairs
+    fetched = set(data.columns.get_level_values(0))
+    
+    lines = []
+    for benchmark in benchmarks:
+        closes = (
+            data[benchmark]['Close'].dropna().to_numpy()
+            if benchmark in fetched else None
+        )
+        
+        if closes is None or closes.size == 0:
+            lines.append(f"{benchmark}: Could not fetch data")
+        else:
+            lines.append(f"{benchmark}: {_format_return(float(closes[0]), float(closes[-1]))}")
+    
+    return "\n".join(lines)
 
 
-@tool(args_schema=ScreenerInput)
-def mutual_fund_screener(
+# Screener category -> table name (also the table whitelist)
+_CATEGORY_TABLE_MAP: Dict[str, str] = {
+    "Large cap funds": "LARGE_CAP_FUNDS",
+    "Mid cap funds": "MID_CAP_FUNDS",
+    "Flexi cap funds": "FLEXI_CAP_FUNDS",
+    "Small cap funds": "SMALL_CAP_FUNDS"
+}
+_VALID_CATEGORIES = tuple(_CATEGORY_TABLE_MAP)
+
+
+def build_screener_query(
     weight_returns_3m: float,
     weight_alpha_1y: float,
     weight_beta_1y: float,
     category: str
-) -> str:
+) -> Tuple[str, Dict[str, float]]:
     """
-    Screens mutual funds based on weighted performance metrics and ranks them.
+    Build the parameterized screener query for a fund category
     
-    This tool requires human approval before execution due to its analytical nature.
+    The SQL text depends only on the table, so SQLite can reuse the
+    prepared statement across weight combinations.
     
     Args:
         weight_returns_3m: Weight for 3-month returns (0-1)
@@ -112,34 +221,85 @@ def mutual_fund_screener(
         category: Fund category to screen
     
     Returns:
-        Ranked list of funds with aggregate scores
-    """
-    # Map category to table name
-    category_table_map = {
-        "Large cap funds": "LARGE_CAP_FUNDS",
-        "Mid cap funds": "MID_CAP_FUNDS",
-        "Flexi cap funds": "FLEXI_CAP_FUNDS",
-        "Small cap funds": "SMALL_CAP_FUNDS"
-    }
+        Tuple of (SQL with named placeholders, bind parameters)
     
-    table_name = category_table_map.get(category)
+    Raises:
+        ValueError: If the category is unknown
+    """
+    table_name = _CATEGORY_TABLE_MAP.get(category)
     
     if not table_name:
-        return f"Invalid category: {category}. Valid options: {list(category_table_map.keys())}"
+        raise ValueError(
+            f"Invalid category: {category}. Valid options: {list(_VALID_CATEGORIES)}"
+        )
     
-    # Note: This returns the query string
-    # Actual execution happens through the SQL agent
+    # Table name comes from the whitelist above; weights are bound
     query = f"""
     SELECT Fund_Name, 
-           ( (Returns_3m * {weight_returns_3m}) + 
-             (Alpha_1y * {weight_alpha_1y}) +
-             (Beta_1y * {weight_beta_1y}) ) AS aggregate_score
+           ( (Returns_3m * :weight_returns_3m) + 
+             (Alpha_1y * :weight_alpha_1y) +
+             (Beta_1y * :weight_beta_1y) ) AS aggregate_score
     FROM {table_name}
     ORDER BY aggregate_score DESC
     LIMIT 10;
     """
+    params = {
+        "weight_returns_3m": weight_returns_3m,
+        "weight_alpha_1y": weight_alpha_1y,
+        "weight_beta_1y": weight_beta_1y,
+    }
     
-    return query
+    return query, params
+
+
+def make_mutual_fund_screener(db):
+    """
+    Create the screener tool bound to a database
+    
+    Args:
+        db: SQLDatabase instance the screener query runs against
+    
+    Returns:
+        mutual_fund_screener tool
+    """
+    @tool("mutual_fund_screener", args_schema=ScreenerInput)
+    def mutual_fund_screener(
+        weight_returns_3m: float,
+        weight_alpha_1y: float,
+        weight_beta_1y: float,
+        category: str
+    ) -> str:
+        """
+        Screens mutual funds based on weighted performance metrics and ranks them.
+        
+        Runs the ranking query itself and returns the top 10 funds in the
+        category, ordered by their weighted aggregate score. The three
+        weights must sum to 1.
+        
+        Args:
+            weight_returns_3m: Weight for 3-month returns (0-1)
+            weight_alpha_1y: Weight for 1-year alpha (0-1)
+            weight_beta_1y: Weight for 1-year beta (0-1)
+            category: Fund category to screen
+        
+        Returns:
+            Ranked rows (with column names) of funds and their aggregate
+            scores, or an error message
+        """
+        try:
+            query, params = build_screener_query(
+                weight_returns_3m, weight_alpha_1y, weight_beta_1y, category
+            )
+        except ValueError as e:
+            return str(e)
+        
+        # Bound parameters keep the SQL text stable (and injection-safe)
+        try:
+            return db.run(query, include_columns=True, parameters=params)
+        except Exception as e:
+            return f"Error running screener query: {str(e)}"
+    
+    return mutual_fund_screener
 
 
 # ============================================
@@ -157,14 +317,17 @@ def get_all_tools(db, llm):
     Returns:
         List of all available tools
     """
+    from langchain_community.agent_toolkits import SQLDatabaseToolkit
+    
     # SQL Database Toolkit
     toolkit = SQLDatabaseToolkit(db=db, llm=llm)
     sql_tools = toolkit.get_tools()
     
     # Custom tools
     custom_tools = [
-        mutual_fund_screener,
-        get_benchmark_data
+        make_mutual_fund_screener(db),
+        get_benchmark_data,
+        get_benchmark_data_batch
     ]
     
     # Combine all tools
@@ -187,6 +350,10 @@ TOOL_DESCRIPTIONS = {
     Fetches point-to-point returns for Indian market benchmarks.
     Supports Nifty 50, Nifty 100, Nifty Midcap 150, and Nifty 500.
     """,
+    
+    "get_benchmark_data_batch": """
+    Fetches point-to-point returns for several benchmarks in one parallel download.
+    """,
 }
 
 
@@ -200,11 +367,7 @@ if __name__ == "__main__":
     result = get_benchmark_data.invoke({"benchmark": "^NSEI", "period": "1y"})
     print(f"Nifty 50 (1Y): {result}")
     
-    print("\nTesting mutual_fund_screener:")
-    result = mutual_fund_screener.invoke({
-        "weight_returns_3m": 0.5,
-        "weight_alpha_1y": 0.3,
-        "weight_beta_1y": 0.2,
-        "category": "Large cap funds"
-    })
-    print(f"Query: {result}")
+    print("\nTesting build_screener_query:")
+    query, params = build_screener_query(0.5, 0.3, 0.2, "Large cap funds")
+    print(f"Query: {query}")
+    print(f"Params: {params}")
@@ -4,30 +4,57 @@ Centralized configuration for the Fund Portfolio Intelligence System
 """
 
 import os
+import functools
 from pathlib import Path
-from typing import Optional
-from pydantic import BaseModel, Field, validator
+from typing import Annotated
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, field_validator
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Repository root (src/utils/config.py -> project root)
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+# ============================================
+# Reusable Field Validators
+# ============================================
+
+def _check_https(v: str) -> str:
+    if not v.startswith('https://'):
+        raise ValueError('Azure endpoint must start with https://')
+    return v
+
+
+def _check_neo4j_url(v: str) -> str:
+    if not v.startswith(('neo4j://', 'neo4j+s://')):
+        raise ValueError('Neo4j URL must start with neo4j:// or neo4j+s://')
+    return v
+
+
+HttpsUrl = Annotated[str, AfterValidator(_check_https)]
+Neo4jUrl = Annotated[str, AfterValidator(_check_neo4j_url)]
+
+
+# Sections are built once per Settings and never mutated: frozen models
+# are hashable and reject accidental writes
+_SECTION_CONFIG = ConfigDict(frozen=True, extra='ignore')
+
 
 class AzureConfig(BaseModel):
     """Azure Document Intelligence Configuration"""
-    endpoint: str = Field(..., description="Azure Document Intelligence endpoint")
-    key: str = Field(..., description="Azure API key")
+    model_config = _SECTION_CONFIG
     
-    @validator('endpoint')
-    def validate_endpoint(cls, v):
-        if not v.startswith('https://'):
-            raise ValueError('Azure endpoint must start with https://')
-        return v
+    endpoint: HttpsUrl = Field(..., description="Azure Document Intelligence endpoint")
+    key: str = Field(..., description="Azure API key")
 
 
 class GroqConfig(BaseModel):
     """Groq API Configuration"""
+    model_config = _SECTION_CONFIG
+    
     api_key: str = Field(..., description="Groq API key")
     model: str = Field(
         default="moonshotai/kimi-k2-instruct-0905",
@@ -38,40 +65,49 @@ class GroqConfig(BaseModel):
 
 class Neo4jConfig(BaseModel):
     """Neo4j Database Configuration"""
-    url: str = Field(..., description="Neo4j connection URL")
+    model_config = _SECTION_CONFIG
+    
+    url: Neo4jUrl = Field(..., description="Neo4j connection URL")
     username: str = Field(default="neo4j")
     password: str = Field(..., description="Neo4j password")
-    
-    @validator('url')
-    def validate_url(cls, v):
-        if not (v.startswith('neo4j://') or v.startswith('neo4j+s://')):
-            raise ValueError('Neo4j URL must start with neo4j:// or neo4j+s://')
-        return v
+    database: str = Field(default="neo4j", description="Target Neo4j database")
+    pool_size: int = Field(default=50, ge=1, description="Max driver connection pool size")
+    connection_acquisition_timeout: float = Field(
+        default=60.0, gt=0, description="Seconds to wait for a pooled connection"
+    )
+    max_transaction_retry_time: float = Field(
+        default=30.0, ge=0, description="Seconds to retry transient transaction failures"
+    )
+    fetch_size: int = Field(default=1000, ge=1, description="Records fetched per batch")
 
 
 class DatabaseConfig(BaseModel):
     """SQL Database Configuration"""
+    model_config = _SECTION_CONFIG
+    
     sqlite_path: Path = Field(..., description="Path to SQLite database")
+    pool_size: int = Field(default=5, ge=1, description="SQLite connection pool size")
     
-    @validator('sqlite_path')
-    def validate_path(cls, v):
-        v = Path(v)
-        if not v.parent.exists():
-            v.parent.mkdir(parents=True, exist_ok=True)
+    @field_validator('sqlite_path')
+    @classmethod
+    def validate_path(cls, v: Path) -> Path:
+        os.makedirs(v.parent, exist_ok=True)
         return v
 
 
 class DataConfig(BaseModel):
     """Data File Configuration"""
+    model_config = _SECTION_CONFIG
+    
     isin_mapping_path: Path = Field(..., description="Path to ISIN master data")
     raw_data_dir: Path = Field(default=Path("data/raw"))
     processed_data_dir: Path = Field(default=Path("data/processed"))
     
-    @validator('isin_mapping_path', 'raw_data_dir', 'processed_data_dir')
-    def validate_data_path(cls, v):
-        v = Path(v)
-        if not v.exists() and 'dir' in v.name:
-            v.mkdir(parents=True, exist_ok=True)
+    @field_validator('raw_data_dir', 'processed_data_dir')
+    @classmethod
+    def validate_data_dir(cls, v: Path) -> Path:
+        # One makedirs call per directory (no separate exists() check)
+        os.makedirs(v, exist_ok=True)
         return v
 
 
@@ -99,9 +135,22 @@ class Settings(BaseSettings):
     neo4j_url: str = Field(..., env="NEO4J_URL")
     neo4j_username: str = Field(default="neo4j", env="NEO4J_USERNAME")
     neo4j_password: str = Field(..., env="NEO4J_PASSWORD")
+    neo4j_database: str = Field(default="neo4j", env="NEO4J_DATABASE")
+    neo4j_pool_size: int = Field(default=50, env="NEO4J_POOL_SIZE")
+    neo4j_acquisition_timeout: float = Field(default=60.0, env="NEO4J_ACQUISITION_TIMEOUT")
+    neo4j_max_retry_time: float = Field(default=30.0, env="NEO4J_MAX_RETRY_TIME")
+    neo4j_fetch_size: int = Field(default=1000, env="NEO4J_FETCH_SIZE")
+    neo4j_schema_cache_path: str = Field(
+        default="data/cache/neo4j_schema.json",
+        env="NEO4J_SCHEMA_CACHE_PATH"
+    )
+    neo4j_schema_cache_ttl: int = Field(default=86400, env="NEO4J_SCHEMA_CACHE_TTL")
     
     # Database Configuration
     sqlite_db_path: str = Field(..., env="SQLITE_DB_PATH")
+    sqlite_pool_size: int = Field(default=5, env="SQLITE_POOL_SIZE")
+    checkpoint_db_path: str = Field(default="data/checkpoints.db", env="CHECKPOINT_DB_PATH")
+    checkpoint_ttl_hours: int = Field(default=24, env="CHECKPOINT_TTL_HOURS")
     
     # Data Paths
     isin_mapping_path: str = Field(..., env="ISIN_MAPPING_PATH")
@@ -110,6 +159,7 @@ class Settings(BaseSettings):
     
     # Processing Configuration
     max_parallel_pdf: int = Field(default=3, env="MAX_PARALLEL_PDF")
+    max_parallel_tables: int = Field(default=4, env="MAX_PARALLEL_TABLES")
     batch_size: int = Field(default=10, env="BATCH_SIZE")
     
     # Query Configuration
@@ -117,12 +167,20 @@ class Settings(BaseSettings):
     graph_query_timeout: int = Field(default=30, env="GRAPH_QUERY_TIMEOUT")
     top_k_results: int = Field(default=10, env="TOP_K_RESULTS")
     
+    @field_validator('neo4j_schema_cache_path')
+    @classmethod
+    def resolve_cache_path(cls, v: str) -> str:
+        # Relative to the project root, not the working directory, so the
+        # cache is found wherever the app is started from
+        path = Path(v)
+        return str(path if path.is_absolute() else PROJECT_ROOT / path)
+    
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
         case_sensitive = False
     
-    @property
+    @functools.cached_property
     def azure(self) -> AzureConfig:
         """Get Azure configuration"""
         return AzureConfig(
@@ -130,7 +188,7 @@ class Settings(BaseSettings):
             key=self.azure_key
         )
     
-    @property
+    @functools.cached_property
     def groq(self) -> GroqConfig:
         """Get Groq configuration"""
         return GroqConfig(
@@ -139,23 +197,29 @@ class Settings(BaseSettings):
             temperature=self.groq_temperature
         )
     
-    @property
+    @functools.cached_property
     def neo4j(self) -> Neo4jConfig:
         """Get Neo4j configuration"""
         return Neo4jConfig(
             url=self.neo4j_url,
             username=self.neo4j_username,
-            password=self.neo4j_password
+            password=self.neo4j_password,
+            database=self.neo4j_database,
+            pool_size=self.neo4j_pool_size,
+            connection_acquisition_timeout=self.neo4j_acquisition_timeout,
+            max_transaction_retry_time=self.neo4j_max_retry_time,
+            fetch_size=self.neo4j_fetch_size
         )
     
-    @property
+    @functools.cached_property
     def database(self) -> DatabaseConfig:
         """Get database configuration"""
         return DatabaseConfig(
-            sqlite_path=Path(self.sqlite_db_path)
+            sqlite_path=Path(self.sqlite_db_path),
+            pool_size=self.sqlite_pool_size
         )
     
-    @property
+    @functools.cached_property
     def data(self) -> DataConfig:
         """Get data configuration"""
         return DataConfig(
@@ -165,39 +229,38 @@ class Settings(BaseSettings):
         )
 
 
-# Singleton instance
-_settings: Optional[Settings] = None
-
-
+@functools.cache
 def get_settings() -> Settings:
     """Get or create settings singleton"""
-    global _settings
-    if _settings is None:
-        _settings = Settings()
-    return _settings
+    return Settings()
 
 
-# Export commonly used configs
+# Export commonly used configs (built and validated once per process)
+@functools.cache
 def get_azure_config() -> AzureConfig:
     """Get Azure configuration"""
     return get_settings().azure
 
 
+@functools.cache
 def get_groq_config() -> GroqConfig:
     """Get Groq configuration"""
     return get_settings().groq
 
 
+@functools.cache
 def get_neo4j_config() -> Neo4jConfig:
     """Get Neo4j configuration"""
     return get_settings().neo4j
 
 
+@functools.cache
 def get_database_config() -> DatabaseConfig:
     """Get database configuration"""
     return get_settings().database
 
 
+@functools.cache
 def get_data_config() -> DataConfig:
     """Get data configuration"""
     return get_settings().data
@@ -0,0 +1,47 @@
+"""
+LLM Client Module
+Shared, process-wide LLM clients
+"""
+
+import functools
+from typing import Optional
+
+from langchain_groq import ChatGroq
+
+from src.utils.config import get_groq_config
+
+
+@functools.lru_cache(maxsize=None)
+def _chat_groq(model: str, temperature: float, api_key: str) -> ChatGroq:
+    """Build (once per argument set) a ChatGroq client"""
+    return ChatGroq(
+        model=model,
+        api_key=api_key,
+        temperature=temperature
+    )
+
+
+def get_chat_groq(
+    model: Optional[str] = None,
+    temperature: Optional[float] = None
+) -> ChatGroq:
+    """
+    Get a shared ChatGroq client
+    
+    Reusing one client per (model, temperature) keeps its HTTP connection
+    pool warm and sends byte-identical request prefixes, which is what
+    Groq's automatic prompt caching matches on.
+    
+    Args:
+        model: Optional model name. If None, loads from settings
+        temperature: Optional temperature. If None, loads from settings
+        
+    Returns:
+        ChatGroq instance
+    """
+    config = get_groq_config()
+    return _chat_groq(
+        model or config.model,
+        config.temperature if temperature is None else temperature,
+        config.api_key
+    )